@@ -2,6 +2,7 @@
 from .nodes import START, END, Node
 from .states import State, Shared, StateProtocol, SharedProtocol, StateAttribute, SharedAttribute, Stream
 from .graph.graphs import Graph
+from .graph.types import pure_edge
 # from .graph.types import Config, ErrorConfig
 
 __all__ = [
@@ -14,6 +15,7 @@ __all__ = [
     "SharedAttribute",
     "Stream",
     "Graph",
+    "pure_edge",
     # "Config",
     # "ErrorConfig",
     "START",
@@ -1,10 +1,36 @@
 from enum import StrEnum, auto
-from typing import Any
-from pydantic import BaseModel
-from collections import Counter
+from functools import cache
+from typing import Any, Iterator, NamedTuple, cast
 from collections.abc import Hashable
+from pydantic import BaseModel
+
+from .rich import truncated_rich_repr
+
+
+_NESTED: tuple[type[Any], ...] = (dict, BaseModel)
+"""
+Types of values that are walked by `Diff.recursive_diff` instead of being compared as leaves.
+"""
 
-from .rich import RichReprMixin
+
+type _PathLink = tuple[_PathLink, Hashable] | None
+"""
+A path while walking in `Diff.recursive_diff` as a link to the path of the parent and the last key.
+"""
+
+
+def _materialize_path(base: tuple[Hashable, ...], link: _PathLink) -> tuple[Hashable, ...]:
+    """
+    Turns a linked path into a tuple of keys that starts with the base path.
+    """
+
+    keys: list[Hashable] = []
+
+    while link is not None:
+        link, key = link
+        keys.append(key)
+
+    return (*base, *reversed(keys))
 
 
 class ChangeTypes(StrEnum):
@@ -16,15 +42,23 @@ class ChangeTypes(StrEnum):
     REMOVED = auto()
     UPDATED = auto()
 
-class Change(RichReprMixin, BaseModel):
+class Change(NamedTuple):
     """
     Represents a change made to a State.
+
+    A diff creates one change per changed path, so changes are lightweight named tuples instead of validated models.
+    Values longer than MAX_CHARS_PER_VALUE characters are shortened in the rich representation.
     """
 
     type: ChangeTypes
     old: Any
     new: Any
 
+    MAX_CHARS_PER_VALUE = 2000
+
+    def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
+        yield from truncated_rich_repr(zip(self._fields, self), self.MAX_CHARS_PER_VALUE)
+
 
 class Diff:
     """
@@ -47,15 +81,12 @@ class Diff:
         if len(changes) <= 1:
             return {}
         
-        counts = Counter(key for d in changes for key in d)
-
-        duplicate_keys = [k for k, count in counts.items() if count > 1]
+        grouped: dict[tuple[Hashable, ...], list[Change]] = {}
+        for d in changes:
+            for key, change in d.items():
+                grouped.setdefault(key, []).append(change)
 
-        conflicts: dict[tuple[Hashable, ...], list[Change]] = {}        
-        for key in duplicate_keys:
-            conflicts[key] = [d[key] for d in changes if key in d]
-
-        return conflicts
+        return {k: v for k, v in grouped.items() if len(v) > 1}
 
 
     @classmethod
@@ -63,6 +94,15 @@ class Diff:
         """
         Recursively computes the differences between two dictionaries.
 
+        The nested dictionaries are walked in a single pass with an explicit stack instead of recursive calls.
+        Keys that exist in only one of the dictionaries are recorded directly without descending into their values.
+        Levels with the same keys in both dictionaries are only compared as key views, without checking every key.
+        Leaves are compared directly, so only nested dictionaries and models are pushed to the stack.
+        Pydantic models are walked like the dictionaries `model_dump` would create from them, without dumping them.
+        A model is only walked if the other value is a model too. Otherwise the model itself is recorded as the old or new value.
+        Identical objects are skipped without comparing them.
+        The paths are built as links to the parent path while walking and only turned into tuples for the recorded changes.
+
 
         Args:
             old: Part of the old dictionary.
@@ -73,27 +113,81 @@ class Diff:
             A mapping of the path to the changes directly on that level.
         """
 
-        path = path or ()
+        if old is new:
+            return {}
+
+        base = path or ()
         changes: dict[tuple[Hashable, ...], Change] = {}
+        stack: list[tuple[Any, Any, _PathLink]] = [(old, new, None)]
 
-        if isinstance(old, dict) and isinstance(new, dict):
-            all_keys: set[str] = set(old.keys()) | set(new.keys()) #type: ignore
+        while stack:
 
-            for key in all_keys:
-                current_path: tuple[Hashable, ...] = (*path, key)
+            old, new, link = stack.pop()
 
-                if key in old and not key in new:
-                    changes[current_path] = Change(type=ChangeTypes.REMOVED, old=old[key], new=None)
-                elif key in new and not key in old:
-                    changes[current_path] = Change(type=ChangeTypes.ADDED, old=None, new=new[key])
-                else:
-                    sub_changes = cls.recursive_diff(old[key], new[key], current_path)
-                    changes.update(sub_changes)
+            if old is new:
+                continue
+
+            if isinstance(old, BaseModel) and isinstance(new, BaseModel): # A model on one side only is recorded as it is
+                old = _model_values(old)
+                new = _model_values(new)
+
+            if isinstance(old, dict) and isinstance(new, dict):
+
+                old_dict = cast("dict[Hashable, Any]", old)
+                new_dict = cast("dict[Hashable, Any]", new)
+
+                same_keys = old_dict.keys() == new_dict.keys() # Nothing was added or removed on this level
+
+                for key, old_value in old_dict.items():
+
+                    if same_keys or key in new_dict:
+
+                        new_value = new_dict[key]
 
-        elif old != new:
-            changes[path] = Change(type=ChangeTypes.UPDATED, old=old, new=new)
+                        if old_value is new_value:
+                            continue
+
+                        if isinstance(old_value, _NESTED) or isinstance(new_value, _NESTED):
+                            stack.append((old_value, new_value, (link, key)))
+
+                        elif old_value != new_value: # Leaves are compared directly instead of being pushed to the stack
+                            changes[_materialize_path(base, (link, key))] = Change(type=ChangeTypes.UPDATED, old=old_value, new=new_value)
+
+                    else:
+                        changes[_materialize_path(base, (link, key))] = Change(type=ChangeTypes.REMOVED, old=old_value, new=None)
+
+                if same_keys:
+                    continue
+
+                for key, new_value in new_dict.items():
+                    if key not in old_dict:
+                        changes[_materialize_path(base, (link, key))] = Change(type=ChangeTypes.ADDED, old=None, new=new_value)
+
+            elif old != new:
+                changes[_materialize_path(base, link)] = Change(type=ChangeTypes.UPDATED, old=old, new=new)
 
         return changes
+
+
+    @classmethod
+    def recursive_diff_models(cls, old: BaseModel, new: BaseModel) -> dict[tuple[Hashable, ...], Change]:
+        """
+        Computes the differences between two pydantic models without dumping them.
+
+        The paths and values are the same as for the dictionaries of `model_dump`, except that changed values that are models stay models.
+
+        Args:
+            old: The old model.
+            new: The new model.
+
+        Returns:
+            A mapping of the path to the changes directly on that level.
+        """
+
+        old_values = _model_values(old)
+        new_values = _model_values(new)
+
+        return cls.recursive_diff(old_values, new_values)
     
 
     @classmethod
@@ -101,35 +195,74 @@ class Diff:
         """
         Applies a set of changes to the target dictionary.
 
+        The changes are grouped by the path of their parent dictionary, so every parent is navigated only once.
+        Within a parent the keys are removed first and then updated or added.
+        Missing parent dictionaries are only created for updated or added keys.
+
 
         Args:
             target: The dictionary to apply the changes to.
             changes: A mapping of paths to changes. The paths are tuples of keys that lead to the value that needs to changes. The changes are applied in the dictionary on that level.
         """
 
+        groups: dict[tuple[Hashable, ...], tuple[list[Hashable], list[tuple[Hashable, Any]]]] = {}
+
         for path, change in changes.items():
+
+            removed, assigned = groups.setdefault(path[:-1], ([], []))
+
+            if change.type == ChangeTypes.REMOVED:
+                removed.append(path[-1])
+            else:
+                # UPDATED or ADDED
+                assigned.append((path[-1], change.new))
+
+        for parent, (removed, assigned) in groups.items():
             cursor = target
             
             # Navigate down the dictionary
-            for part in path[:-1]:
-                if part not in cursor:
-                    cursor[part] = {} # If the path was created because of ADDED
-                cursor = cursor[part]
-            
-            last_key = path[-1]
-
-            if change.type == ChangeTypes.REMOVED:
-                print("DELETE KEY:")
-                print(last_key)
+            for part in parent:
+                try:
+                    cursor = cursor[part]
+                except KeyError:
+                    if not assigned: # Keys can only be removed from existing dictionaries
+                        raise KeyError(f"Unable to remove keys: {removed} because the path {parent} was not found in target dictionary {target}")
+                    cursor[part] = cursor = {} # If the path was created because of ADDED
+
+            for last_key in removed:
                 if last_key in cursor:
                     del cursor[last_key]
                 else:
-                    raise KeyError(f"Unable to remove key: {last_key} not found in target dictionary under path {path} from {target}")
-                
-            else:
-                # UPDATED or ADDED
-                cursor[last_key] = change.new
+                    raise KeyError(f"Unable to remove key: {last_key} not found in target dictionary under path {(*parent, last_key)} from {target}")
+
+            for last_key, value in assigned:
+                cursor[last_key] = value
+
+
+
+def _model_values(model: BaseModel) -> dict[str, Any]:
+    """
+    Returns the values of a model that `model_dump` would include, without copying or dumping them.
+    """
+
+    excluded = _excluded_fields(type(model))
+    values: dict[str, Any] = vars(model)
+
+    if excluded:
+        values = {k: v for k, v in values.items() if k not in excluded}
+
+    extra = model.__pydantic_extra__
+
+    return {**values, **extra} if extra else values
+
+
+@cache
+def _excluded_fields(cls: type[BaseModel]) -> frozenset[str]:
+    """
+    Returns the fields of a model class that are excluded from `model_dump`.
+    """
 
+    return frozenset(name for name, field in cls.model_fields.items() if field.exclude)
 
 
 class ChangeConflictException(Exception):
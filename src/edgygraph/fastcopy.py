@@ -0,0 +1,104 @@
+from copy import deepcopy
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, cast
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+
+_IMMUTABLE_TYPES: frozenset[type] = frozenset({
+    type(None), bool, int, float, complex, str, bytes, range,
+    date, datetime, time, timedelta, Decimal, UUID,
+})
+"""
+Types whose instances are immutable and therefore shared between the original and the copy.
+"""
+
+
+def fast_copy(value: Any) -> Any:
+    """
+    Copies a value of a state while sharing its immutable leaves.
+
+    Only mutable containers (dicts, lists, sets) and pydantic models are copied.
+    Immutable values are returned as they are. Unknown types fall back to `copy.deepcopy`.
+
+    Unlike `copy.deepcopy` no memo is kept. Therefore multiple references to the same container are copied into independent containers.
+
+    Args:
+        value: The value to copy.
+
+    Returns:
+        A copy of the value that can be mutated independently of the original.
+    """
+
+    cls = cast("type[Any]", type(value))
+
+    if cls in _IMMUTABLE_TYPES:
+        return value
+
+    # Immutable items are checked inline to save a call per leaf
+    immutable = _IMMUTABLE_TYPES
+
+    if cls is dict:
+        return {k: v if type(v) in immutable else fast_copy(v) for k, v in value.items()}
+
+    if cls is list:
+        return [v if type(v) in immutable else fast_copy(v) for v in value]
+
+    if cls is set:
+        return {v if type(v) in immutable else fast_copy(v) for v in value}
+
+    if cls is frozenset:
+        return frozenset(v if type(v) in immutable else fast_copy(v) for v in value)
+
+    if cls is tuple:
+        items = tuple(v if type(v) in immutable else fast_copy(v) for v in value)
+        return value if all(a is b for a, b in zip(items, value)) else items
+
+    if isinstance(value, BaseModel):
+        return fast_state_copy(value)
+
+    if isinstance(value, (Enum, PurePath)):
+        return value
+
+    return deepcopy(value)
+
+
+def fast_state_copy[M: BaseModel](state: M) -> M:
+    """
+    Creates a deep copy of a pydantic model without the overhead of `model_copy(deep=True)`.
+
+    The fields are walked once with `fast_copy`, so immutable leaves are shared and only mutable containers are copied.
+    The copy is constructed without validation, like `model_copy` does.
+
+    Args:
+        state: The model to copy.
+
+    Returns:
+        An independent copy of the model.
+    """
+
+    copied = state.__class__.__new__(state.__class__)
+
+    object.__setattr__(copied, "__dict__", {k: fast_copy(v) for k, v in state.__dict__.items()})
+    object.__setattr__(copied, "__pydantic_extra__", fast_copy(state.__pydantic_extra__))
+    object.__setattr__(copied, "__pydantic_fields_set__", set(state.__pydantic_fields_set__))
+
+    object.__setattr__(copied, "__pydantic_private__", _copy_private(state.__pydantic_private__))
+
+    return copied
+
+
+def _copy_private(private: dict[str, Any] | None) -> dict[str, Any] | None:
+    """
+    Copies the private attributes of a model. Unset attributes are dropped like in `BaseModel.__deepcopy__`.
+    """
+
+    if private is None:
+        return None
+
+    return {k: fast_copy(v) for k, v in private.items() if v is not PydanticUndefined}
@@ -1,12 +1,12 @@
 from __future__ import annotations
 from typing import Hashable
-from collections import defaultdict
 from collections.abc import Hashable
 import asyncio
+from itertools import pairwise
 
 from ..states import StateProtocol, SharedProtocol
 from ..diff import Change
-from .types import Edge, ErrorEdge, Entry, ErrorEntry, SingleErrorSource, Types, BranchContainer, SingleSource, NextWithConfig, SourceWithConfig, Source, SingleNext, Next, ErrorSource
+from .types import Edge, ErrorEdge, Entry, ErrorEntry, NextNode, SingleErrorSource, Types, BranchContainer, SingleSource, NextWithConfig, SourceWithConfig, Source, SingleNext, Next, ErrorSource
 
 
 class Branch[T: StateProtocol, S: SharedProtocol]:
@@ -22,6 +22,8 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
 
     """
 
+    # Branches are hashed by identity, the same edges can belong to branches with different sources
+    __slots__ = ("edges", "source", "join", "result", "edge_index", "error_edge_index", "error_entries", "plan", "frontier_cache")
 
     def __init__(self, edges: BranchContainer[T, S], source: SingleSource[T, S]) -> None:
 
@@ -31,8 +33,12 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
 
         self.result: asyncio.Future[dict[tuple[Hashable, ...], Change]] | None = None
 
-        self.edge_index: dict[SingleSource[T, S], list[Entry[T, S]]] = defaultdict(list)
-        self.error_edge_index: dict[SingleErrorSource[T, S], list[ErrorEntry[T, S]]] = defaultdict(list)
+        self.edge_index: dict[SingleSource[T, S], list[Entry[T, S]]] = {}
+        self.error_edge_index: dict[SingleErrorSource[T, S], list[ErrorEntry[T, S]]] = {}
+        self.error_entries: list[tuple[SingleErrorSource[T, S], ErrorEntry[T, S]]] = []
+
+        self.plan: dict[tuple[SingleSource[T, S], ...], list[NextNode[T, S]]] = {}
+        self.frontier_cache: dict[tuple[SingleSource[T, S], ...], tuple[Entry[T, S], ...]] = {}
 
         self.index_edges()
 
@@ -40,15 +46,35 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
     def index_edges(self) -> None:
         """
         Index the edges by single source.
+
+        The plan and the frontier cache of the branch are discarded.
         """
 
+        self.plan.clear()
+        self.frontier_cache.clear()
+
+        # Bound once, every subscription of Types creates a new generic alias
+        types = Types[T, S]
+        is_any_source = types.is_any_source
+        is_next = types.is_next
+        is_next_with_config = types.is_next_with_config
+        is_single_source = types.is_single_source
+        is_single_error_source = types.is_single_error_source
+        entry_class = Entry[T, S]
+        error_entry_class = ErrorEntry[T, S]
+
+        edge_index = self.edge_index
+        error_edge_index = self.error_edge_index
+
+
+        for i, (source, next) in enumerate(pairwise(self.edges)):
 
-        for i, (source, next) in enumerate(zip(self.edges, self.edges[1:])):
+            source_is_any_source = is_any_source(source)
 
-            if not Types[T, S].is_any_source(source) and not Types[T, S].is_next(next):
+            if not source_is_any_source and not is_next(next):
                 raise ValueError(f"Invalid edge: source: {source}, next: {next} in branch with source {self.source} and join {self.join}")
 
-            if Types[T, S].is_any_source(source) and Types[T, S].is_next_with_config(next):
+            if source_is_any_source and is_next_with_config(next):
                 
                 try:
 
@@ -57,7 +83,7 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
 
                 except EmptyFilterResult:
 
-                    if Types[T, S].is_any_source(next) and Types[T, S].is_next_with_config(source):
+                    if is_any_source(next) and is_next_with_config(source):
                         try:
                             self.filter_source_by_config(next)
                             self.filter_next_by_config(source)
@@ -70,17 +96,82 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
 
                 sources = filtered_source if isinstance(filtered_source, list) else [filtered_source]
 
+                # Entries are created once per edge and shared by its sources
+                entry: Entry[T, S] | None = None
+                error_entry: ErrorEntry[T, S] | None = None
+
                 for s in sources:
 
-                    if Types[T, S].is_single_source(s):
-                        self.index_edge(Edge(source=s, next=filtered_next), i)
-                    elif Types[T, S].is_single_error_source(s):
-                        self.index_edge(ErrorEdge(source=s, next=filtered_next), i)
+                    if is_single_source(s):
+                        if entry is None:
+                            entry = entry_class(next=filtered_next, index=i)
+                        edge_index.setdefault(s, []).append(entry)
+                    elif is_single_error_source(s):
+                        if error_entry is None:
+                            error_entry = error_entry_class(next=filtered_next, index=i)
+                        error_edge_index.setdefault(s, []).append(error_entry)
                     else:
                         raise ValueError(f"Invalid filtered source: {filtered_source} from original source: {source} in branch with source {self.source} and join {self.join}")
-            
+
+        self.sort_error_entries()
+
+
+    def sort_error_entries(self) -> None:
+        """
+        Flatten the error edge index into `error_entries`, sorted by the index of the entries.
+
+        The sort is stable, so an entry that is shared by multiple sources of the same edge stays adjacent.
+        """
+
+        self.error_entries = sorted(
+            ((source, entry) for source, entries in self.error_edge_index.items() for entry in entries),
+            key=lambda item: item[1].index,
+        )
                         
             
+    def frontier_entries(self, frontier: tuple[SingleSource[T, S], ...]) -> tuple[Entry[T, S], ...]:
+        """
+        Get the entries of all nodes of a frontier in order.
+
+        The concatenated entries are cached for frontiers whose nodes are all sources of the branch.
+
+        Args:
+            frontier: The current nodes.
+
+        Returns:
+            The entries of the nodes.
+        """
+
+        entries = self.frontier_cache.get(frontier)
+
+        if entries is None:
+
+            entries = tuple(
+                entry
+                for node in frontier
+                for entry in self.edge_index.get(node, ())
+            )
+
+            if all(node in self.edge_index for node in frontier):
+                self.frontier_cache[frontier] = entries
+
+        return entries
+
+
+    def is_plannable(self, entry: Entry[T, S]) -> bool:
+        """
+        Check if the resolved next nodes of an entry can be stored in the plan of the branch.
+
+        This is the case if the next is static or a pure callable (see `pure_edge`).
+
+        Args:
+            entry: The entry to check.
+        """
+
+        # The entry is built from a checked next, so every next that is not callable is resolved
+        return not entry.callable_next or getattr(entry.next, "__edgygraph_pure__", False) is True
+
+
     def index_edge(self, edge: Edge[T, S] | ErrorEdge[T, S], index: int) -> None:
         """
         Index a single edge by its source.
@@ -94,13 +185,11 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
             index: The original index of the edge in the list of edges of the branch.
         """
 
-        print(f"Indexing edge {edge} at index {index} in branch with source {self.source} and join {self.join}")
-
-        match edge:
-            case ErrorEdge(source=source, next=next):
-                self.error_edge_index[source].append(ErrorEntry[T, S](next=next, index=index))
-            case Edge(source=source, next=next):
-                self.edge_index[source].append(Entry[T, S](next=next, index=index))
+        if isinstance(edge, ErrorEdge):
+            self.error_edge_index.setdefault(edge.source, []).append(ErrorEntry[T, S](next=edge.next, index=index))
+            self.sort_error_entries()
+        else:
+            self.edge_index.setdefault(edge.source, []).append(Entry[T, S](next=edge.next, index=index))
         
 
 
@@ -120,7 +209,9 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
             EmptyFilterResult: If the whole source is filtered out.
         """
 
-        if Types[T, S].is_single_source_with_config(source):
+        types = Types[T, S]
+
+        if types.is_single_source_with_config(source):
 
             if isinstance(source, tuple):
 
@@ -131,7 +222,7 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
                 
             return source
         
-        elif Types[T, S].is_single_source_with_config_list(source):
+        elif types.is_single_source_with_config_list(source):
 
             filtered_sources: list[SingleSource[T, S]] = []
 
@@ -152,7 +243,7 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
             
             return filtered_sources
 
-        elif Types[T, S].is_error_source(source):
+        elif types.is_error_source(source):
 
             return source # Error sources have no filters
 
@@ -178,10 +269,12 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
             EmptyFilterResult: If the next is filtered out.
         """
 
-        if Types[T, S].is_next_callable(next):
+        types = Types[T, S]
+
+        if types.is_next_callable(next):
             return next
         
-        elif Types[T, S].is_single_next_with_config(next):
+        elif types.is_single_next_with_config(next):
 
             if isinstance(next, tuple):
 
@@ -192,7 +285,7 @@ class Branch[T: StateProtocol, S: SharedProtocol]:
                 
             return next
         
-        elif Types[T, S].is_single_next_with_config_list(next):
+        elif types.is_single_next_with_config_list(next):
 
             filtered_next: list[SingleNext[T, S]] = []
 
@@ -1,21 +1,28 @@
 
 from __future__ import annotations
 
-from typing import cast, Any, Hashable, Callable
-from collections import defaultdict
+from typing import cast, Any, Hashable, Callable, Awaitable
+from types import CoroutineType
 from collections.abc import Hashable, Sequence
 import asyncio
 import inspect
-import traceback
+from functools import cache
+from weakref import WeakKeyDictionary
+import logging
+
+from pydantic import BaseModel, AfterValidator, BeforeValidator, WrapValidator, PlainValidator
 
 from ..states import StateProtocol, SharedProtocol
 from ..diff import Change, ChangeConflictException, Diff
-from ..nodes import Node, END, START
-from .types import SingleNext, NextNode, ErrorEntry, SingleErrorSource, Entries, BranchContainer, SingleSource, Source, Types, ResolvedNext, BranchJoin
+from ..nodes import Node, FusedNode, END, START
+from ..fastcopy import fast_state_copy
+from .types import NextNode, ErrorEntry, SingleErrorSource, Entries, BranchContainer, SingleSource, Source, Types, ResolvedNext, BranchJoin
 from .hooks import GraphHook
 from .branches import Branch
 
 
+logger = logging.getLogger(__name__)
+
 
 class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol]:
     """
@@ -120,6 +127,9 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
     Attributes:
         edges: A list of branches with compatible nodes that build the graph.
         hooks: A list of graph hook classes. Usable for debugging, logging and custom logic.
+        eager: If the graph should run with `asyncio.eager_task_factory`. Tasks then start executing immediately and synchronous nodes and branches finish without an event loop round trip. Disabled by default, because the factory applies to all tasks created on the loop while the graph runs, also to the ones of other code. The factory is only installed if the running loop has no custom task factory, and it is removed when the last running graph on the loop finishes and the factory was not replaced in the meantime.
+        skip_merge_validation: If the merged state of parallel nodes should be constructed without validation. The changed fields are taken over from the node states as they are, so only use this if the nodes assign valid values. Steps with a single node then also run directly on the state of the branch without copying and validating it. States with field or model validators are always validated.
+        fuse: If linear chains of nodes should be run as a single node on the same state (see `compile`). The state is then only merged and validated after the last node of a chain. Disabled by default, because the nodes of a chain then see the state of the chain instead of a validated state per node.
     """
 
 
@@ -134,30 +144,43 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
 
     def __init__(self, 
             edges: Sequence[BranchContainer[T, S]], 
-            hooks: Sequence[GraphHook[T, S]] | None = None
+            hooks: Sequence[GraphHook[T, S]] | None = None,
+            eager: bool = False,
+            skip_merge_validation: bool = False,
+            fuse: bool = False,
         ) -> None:
 
         self.edges = edges
         self.hooks = hooks or []
+        self.eager = eager
+        self.skip_merge_validation = skip_merge_validation
+        self.fuse = fuse
 
-        self.branch_registry: dict[SingleSource[T, S], list[Branch[T, S]]] = defaultdict(list)
-        self.join_registry: dict[BranchJoin[T, S], list[Branch[T, S]]] = defaultdict(list)
+        # Bound once, every subscription of Types creates a new generic alias
+        self.types = Types[T, S]
+
+        self.branch_registry: dict[SingleSource[T, S], list[Branch[T, S]]] = {}
+        self.join_registry: dict[BranchJoin[T, S], list[Branch[T, S]]] = {}
 
         self.index_branches()
+        self.compile()
 
     def index_branches(self) -> None:
         """
         Index the branches by their sources.
         """
 
+        is_single_source = self.types.is_single_source
+        is_single_source_list = self.types.is_single_source_list
+
         for branch_container in self.edges:
 
             if len(branch_container) < 3:
                 raise ValueError(f"Branch container must have at least one node between source and join, got elements: {branch_container}")
 
-            if Types[T, S].is_single_source(branch_container[0]):
+            if is_single_source(branch_container[0]):
                 sources = [branch_container[0]]
-            elif Types[T, S].is_single_source_list(branch_container[0]):
+            elif is_single_source_list(branch_container[0]):
                 sources = branch_container[0]
             else:
                 raise ValueError(f"Invalid branch source: {branch_container[0]}")
@@ -165,7 +188,126 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
             for source in sources:
 
                 branch = Branch[T, S](edges=branch_container, source=source)
-                self.branch_registry[source].append(branch)
+                self.branch_registry.setdefault(source, []).append(branch)
+
+
+    def compile(self) -> None:
+        """
+        Precompute the execution plan of the branches.
+
+        For every source whose entries all have static or pure nexts (see `pure_edge`), the resolved next nodes are stored in the plan of the branch.
+        At runtime these frontiers are looked up instead of being resolved again.
+        Frontiers with multiple nodes are added to the plan when they are first resolved.
+
+        If `fuse` is set, linear chains in the plan are replaced by fused nodes (see `fuse_chains`).
+
+        Call this method again after changing the edges of a branch to discard the outdated plan.
+        The graph compiles itself again when it is called with a fused plan after hooks were attached or `fuse` was disabled.
+        """
+
+        self.fused = False
+
+        joins = {
+            branch.join
+            for branches in self.branch_registry.values()
+            for branch in branches
+        }
+
+        for branches in self.branch_registry.values():
+            for branch in branches:
+
+                branch.plan.clear()
+
+                for fused in [node for node in branch.edge_index if isinstance(node, FusedNode)]:
+                    del branch.edge_index[fused]
+
+                for source, entries in branch.edge_index.items():
+
+                    if not all(self.types.is_resolved_next(entry.next) for entry in entries):
+                        continue
+
+                    branch.plan[(source,)] = [
+                        NextNode(node=node, reached_by=entry)
+                        for entry in entries
+                        for node in self.get_next_nodes(cast("ResolvedNext[T, S]", entry.next))
+                    ]
+
+                if self.fuse and not self.hooks and not branch.error_edge_index:
+                    self.fused = self.fuse_chains(branch, joins) or self.fused
+
+
+    def fuse_chains(self, branch: Branch[T, S], joins: set[BranchJoin[T, S]]) -> bool:
+        """
+        Replace the linear chains in the plan of a branch by fused nodes.
+
+        A chain starts at a node that is planned as the only node of a step and follows nodes whose planned next is exactly one node.
+        Nodes that spawn or join branches end a chain, because the graph has to see them as a step.
+        The fused node runs the nodes of the chain on the same state, so it is copied and merged once per chain instead of once per node.
+        It takes over the entries and the plan of the last node of the chain.
+
+        Chains are only fused in branches without error edges and in graphs without hooks, where the intermediate steps can not be observed.
+
+        Args:
+            branch: The branch to fuse the chains of.
+            joins: The joins of all branches of the graph.
+
+        Returns:
+            If any chain was fused.
+        """
+
+        def fusible(node: SingleSource[T, S]) -> bool:
+            return self.types.is_node(node) and node not in self.branch_registry and node not in joins
+
+        fused_nodes: dict[tuple[Node[T, S], ...], FusedNode[T, S]] = {}
+        plan: dict[tuple[SingleSource[T, S], ...], list[NextNode[T, S]]] = {}
+
+        for frontier, next_nodes in branch.plan.items():
+
+            plan[frontier] = next_nodes
+
+            if len(next_nodes) != 1: # Parallel nodes see the merged state of each other in the next step
+                continue
+
+            chain: list[Node[T, S]] = [next_nodes[0].node]
+
+            while fusible(chain[-1]):
+
+                successors = branch.plan.get((chain[-1],))
+
+                if not successors or len(successors) != 1:
+                    break
+
+                successor = successors[0].node
+
+                if not fusible(successor) or successor in chain:
+                    break
+
+                chain.append(successor)
+
+            if len(chain) < 2:
+                continue
+
+            fused = fused_nodes.get(tuple(chain))
+
+            if fused is None:
+                fused = fused_nodes[tuple(chain)] = FusedNode[T, S](chain)
+
+            plan[frontier] = [NextNode(node=fused, reached_by=next_nodes[0].reached_by)]
+
+        for nodes, fused in fused_nodes.items():
+
+            last = nodes[-1]
+
+            if (last,) in plan:
+                plan[(fused,)] = plan[(last,)]
+
+            if last in branch.edge_index:
+                branch.edge_index[fused] = branch.edge_index[last]
+
+        branch.plan = plan
+        branch.frontier_cache.clear()
+
+        return bool(fused_nodes)
 
 
     async def __call__(self, state: T, shared: S) -> tuple[T, S]:
@@ -173,30 +315,51 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
         Run the graph on the given state and shared state.
         """
 
+        if self.fused and (self.hooks or not self.fuse): # Fusion was decided before the hooks were attached
+            self.compile()
+
         # Hook
         for h in self.hooks: await h.on_graph_start(state, shared)
 
-        async with asyncio.TaskGroup() as tg:
+        loop = asyncio.get_running_loop()
+        install_eager = self.eager and _enter_eager(loop)
 
-            # Initialization
-            self.tg = tg
+        try:
 
-            for branch in self.branch_registry[START]:
-                self.spawn_branch(state, shared, branch)
+            async with asyncio.TaskGroup() as tg:
+
+                # Initialization
+                self.tg = tg
 
-        state_dict: dict[Hashable, Any] = cast(dict[Hashable, Any], state.model_dump())
+                for branch in self.branch_registry.get(START, ()):
+                    self.spawn_branch(state, shared, branch)
 
-        for branch in self.join_registry[END]:
+        finally:
+
+            if install_eager:
+                _exit_eager(loop)
+
+        changes_list: list[dict[tuple[Hashable, ...], Change]] = []
+
+        for branch in self.join_registry.pop(END, ()): # Taken out, so the next run does not apply them again
 
             if branch.result is None:
                 raise ValueError(f"Branch result is None: {branch}")
 
-            changes = await branch.result
-
-            Diff.apply_changes(state_dict, changes)
+            changes_list.append(await branch.result)
 
         # Final state
-        final_state = state.model_validate(state_dict)
+        if any(changes_list):
+
+            state_dict: dict[Hashable, Any] = cast("dict[Hashable, Any]", state.model_dump())
+
+            for changes in changes_list:
+                Diff.apply_changes(state_dict, changes)
+
+            final_state = self.validate_state(state, state_dict)
+
+        else: # No branch changed the state, also not in place (see run_branch), so validating the unchanged data again would only copy it
+            final_state = fast_state_copy(state) if isinstance(state, BaseModel) else state.model_copy(deep=True)
 
         # Hook
         for h in self.hooks: await h.on_graph_end(final_state, shared)
@@ -217,62 +380,82 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
             New State instance and the same Shared instance
         """
 
-        branch.result = asyncio.Future()
+        result = branch.result
+
+        if result is None or result.done(): # Not spawned by spawn_branch
+            result = branch.result = asyncio.get_running_loop().create_future()
+
+        # Immutable leaves are shared with the snapshot, so the final diff can skip them by identity
+        initial_state: T = fast_state_copy(state) if isinstance(state, BaseModel) else state.model_copy(deep=True)
+
+        # Single nodes run directly on the state of the branch if validation is skipped, the state has no validators and no error edge or hook can observe the state before the failed or merged step
+        in_place = (
+            self.skip_merge_validation and
+            isinstance(state, BaseModel) and not _has_validators(type(state)) and
+            not self.hooks and not branch.error_edge_index
+        )
 
-        initial_state = state.model_copy(deep=True)
+        # Bound once for the step loop
+        hooks = self.hooks
+        get_next = self.get_next
+        spawn_branches = self.spawn_branches
+        join_branches = self.join_branches
+        run_nodes = self.run_nodes
+        merge_states = self.merge_states
+        copy_state: Callable[[T], T] = cast("Callable[[T], T]", fast_state_copy) if isinstance(state, BaseModel) else lambda s: s.model_copy(deep=True)
 
         try:
             
-            next_nodes: list[NextNode[T, S]] = await self.get_next(state, shared, branch.source, branch)
+            next_nodes: list[NextNode[T, S]] = await get_next(state, shared, branch.source, branch)
 
             while next_nodes:
 
                 # Hook
-                for h in self.hooks: await h.on_step_start(state, shared, next_nodes)
+                for h in hooks: await h.on_step_start(state, shared, next_nodes)
 
                 # Run parallel
-                result_states: list[T] = []
+                await spawn_branches(state, shared, next_nodes)
 
-                await self.spawn_branches(state, shared, next_nodes)
-
-                state = await self.join_branches(state, next_nodes)
+                state = await join_branches(state, next_nodes)
 
                 try:
 
-                    async with asyncio.TaskGroup() as tg:
-                        for node in next_nodes:
-                            
-                            state_copy: T = state.model_copy(deep=True)
-                            result_states.append(state_copy)
+                    if in_place and len(next_nodes) == 1:
+
+                        await run_nodes([state], shared, next_nodes) # No other node can conflict, so nothing has to be merged
+
+                    else:
 
-                            tg.create_task(self.node_wrapper(state_copy, shared, node))
+                        result_states = [copy_state(state) for _ in next_nodes]
 
-                    # Merge
-                    state = await self.merge_states(state, result_states)
+                        await run_nodes(result_states, shared, next_nodes)
+
+                        # Merge
+                        state = await merge_states(state, result_states)
 
 
                 except ExceptionGroup as eg:
 
-                    print("ERROR")
-                    print(eg)
+                    logger.debug("Node exceptions in branch %s: %s", branch.source, eg)
 
                     # Hook
-                    for h in self.hooks: await h.on_step_end(state, shared, next_nodes)
+                    for h in hooks: await h.on_step_end(state, shared, next_nodes)
                     
                     next_nodes = await self.get_next_from_error(state, shared, eg, branch)
                     
                 else:
 
                     # Hook
-                    for h in self.hooks: await h.on_step_end(state, shared, next_nodes)
+                    for h in hooks: await h.on_step_end(state, shared, next_nodes)
 
-                    next_nodes = await self.get_next(state, shared, [n.node for n in next_nodes], branch)
+                    next_nodes = await get_next(state, shared, [n.node for n in next_nodes], branch)
         
 
         except Exception as e:
             
             # Hook
-            for h in self.hooks:
+            default_on_error: object = GraphHook.on_error # type: ignore # The default returns the error unchanged
+            for h in [h for h in self.hooks if type(h).on_error is not default_on_error]:
                 e = await h.on_error(e, state, shared)
                 if e is None: 
                     break
@@ -280,10 +463,54 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
             if e:
                 raise e
 
-        branch.result.set_result(Diff.recursive_diff(initial_state.model_dump(), state.model_dump()))
+        result.set_result(self.diff_states(initial_state, state))
 
         
 
+    async def run_nodes(self, states: list[T], shared: S, nodes: list[NextNode[T, S]]) -> None:
+        """
+        Run the nodes in parallel, each on its own state.
+
+        The nodes are gathered instead of being run in a TaskGroup, so with eager tasks synchronous nodes finish without an event loop round trip.
+        A single node is awaited inline in the task of the branch, so sequential steps do not create a task at all.
+        All nodes are run to completion, also if one of them fails.
+
+        Args:
+            states: The states of the nodes in the same order as the nodes.
+            shared: The shared state of the graph.
+            nodes: The nodes to run.
+
+        Raises:
+            ExceptionGroup: If one or more nodes raised an exception.
+        """
+
+        if len(nodes) == 1:
+
+            try:
+                await self.node_wrapper(states[0], shared, nodes[0])
+            except Exception as e:
+                raise ExceptionGroup("Node exceptions", [e])
+
+            return
+
+        results = await asyncio.gather(
+            *(self.node_wrapper(state, shared, node) for state, node in zip(states, nodes)),
+            return_exceptions=True,
+        )
+
+        errors: list[Exception] = []
+
+        for result in results:
+            if isinstance(result, Exception):
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result # Cancellation and interrupts are not node errors
+
+        if errors:
+            raise ExceptionGroup("Node exceptions", errors)
+
+
+
     async def node_wrapper(self, state: T, shared: S, node: NextNode[T, S]):
         """
         Wrapper for the nodes to catch exceptions and add the node to the exception with the key: `source_node`.
@@ -325,22 +552,18 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
             ChangeConflictException: If there are conflicts in the changes.
         """
             
-        result_dicts = [state.model_dump() for state in result_states]
-        current_dict = cast(dict[Hashable, Any], current_state.model_dump())
-
         changes_list: list[dict[tuple[Hashable, ...], Change]] = []
 
 
-        for result_dict in result_dicts:
-
-            changes_list.append(Diff.recursive_diff(current_dict, result_dict))
+        for result_state in result_states:
+            changes_list.append(self.diff_states(current_state, result_state))
         
 
         # Hook
         for h in self.hooks: await h.on_merge_start(current_state, result_states, changes_list)
 
 
-        state = await self.apply_changes(current_state, changes_list)
+        state = await self.apply_changes(current_state, changes_list, result_states)
 
 
         # Hook
@@ -349,19 +572,41 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
         return state
     
 
-    async def apply_changes(self, state: T, changes: list[dict[tuple[Hashable, ...], Change]]) -> T:
+    def diff_states(self, old: T, new: T) -> dict[tuple[Hashable, ...], Change]:
+        """
+        Compute the changes between two states.
+
+        Pydantic states are compared field by field without dumping them.
+
+        Args:
+            old: The old state.
+            new: The new state.
+
+        Returns:
+            The changes by path.
+        """
+
+        if isinstance(old, BaseModel) and isinstance(new, BaseModel):
+            return Diff.recursive_diff_models(old, new)
+
+        return Diff.recursive_diff(old.model_dump(), new.model_dump())
+
+
+    async def apply_changes(self, state: T, changes: list[dict[tuple[Hashable, ...], Change]], result_states: list[T] | None = None) -> T:
         """
         Apply changes to the state.
 
+        If `skip_merge_validation` is enabled and the result states the changes were computed from are given, the merged state is constructed without validation if possible.
+
         Args:
             state: The current state.
             changes: A list of changes to apply.
+            result_states: The states the changes were computed from, in the same order as the changes.
 
         Raises:
             ChangeConflictException: If there are conflicts in the changes.
         """
 
-        state_dict = cast(dict[Hashable, Any], state.model_dump())
         conflicts = Diff.find_conflicts(changes)
 
         if conflicts:
@@ -371,13 +616,97 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
 
             raise ChangeConflictException(f"Conflicts detected: {conflicts}")
         
+
+        if not any(changes): # Nothing to merge, e.g. a step without joining branches
+            return state
+
+
+        if self.skip_merge_validation and result_states is not None:
+
+            merged_state = self.construct_merged_state(state, changes, result_states)
+
+            if merged_state is not None:
+                return merged_state
         
+
+        state_dict = cast("dict[Hashable, Any]", state.model_dump())
+
         for change in changes:
             Diff.apply_changes(state_dict, change)
 
-        return type(state).model_validate(state_dict)
+        return self.validate_state(state, state_dict)
+
+
+    def validate_state(self, state: T, data: dict[Hashable, Any]) -> T:
+        """
+        Validate the data of a state into a new instance of the class of the state.
+
+        For pydantic states the schema validator of the class is called directly, which skips the argument handling of `model_validate`.
+        States that override `model_validate` are still validated through it.
+
+        Args:
+            state: The state whose class is used for the validation.
+            data: The data to validate.
+
+        Returns:
+            The new validated state.
+        """
+
+        cls = type(state)
+
+        if isinstance(state, BaseModel) and state.__pydantic_complete__ and not _overrides_model_validate(type(state)):
+            return cast(T, state.__pydantic_validator__.validate_python(data))
+
+        return cls.model_validate(data)
     
 
+    def construct_merged_state(self, state: T, changes: list[dict[tuple[Hashable, ...], Change]], result_states: list[T]) -> T | None:
+        """
+        Construct the merged state without validation.
+
+        The changed fields are taken over from the result state that changed them, the other fields are shared with the current state.
+        This is only possible if every changed field was changed by a single result state and the state has no validators.
+
+        Args:
+            state: The current state.
+            changes: The conflict free changes of the result states.
+            result_states: The result states in the same order as the changes.
+
+        Returns:
+            The merged state, or None if it has to be constructed with validation.
+        """
+
+        if not isinstance(state, BaseModel) or _has_validators(type(state)):
+            return None
+
+        model_fields = type(state).model_fields
+        sources: dict[str, BaseModel] = {}
+
+        for change, result_state in zip(changes, result_states):
+
+            if not isinstance(result_state, BaseModel):
+                return None
+
+            for path in change:
+
+                field = path[0] if path else None
+
+                if not isinstance(field, str) or field not in model_fields: # Extra fields
+                    return None
+
+                if sources.setdefault(field, result_state) is not result_state: # Field changed by multiple result states
+                    return None
+
+        merged_state = state.model_copy()
+        merged_fields = vars(merged_state)
+
+        for field, result_state in sources.items():
+            merged_fields[field] = vars(result_state)[field]
+            merged_state.__pydantic_fields_set__.add(field)
+
+        return merged_state
+
+
     async def spawn_branches(self, state: T, shared: S, next_nodes: list[NextNode[T, S]]) -> None:
         """
         Spawn branches based on the next nodes.
@@ -387,22 +716,41 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
             next_nodes: The source nodes of the branches to execute.
         """
 
+        hooks = self.hooks
+        branch_registry = self.branch_registry
+
         for node in next_nodes:
-            for branch in self.branch_registry[node.node]:
 
-                for h in self.hooks: await h.on_spawn_branch_start(state, shared, branch, node, self.branch_registry, self.join_registry)
+            branches = branch_registry.get(node.node) # Most nodes are no branch source
+            if not branches:
+                continue
+
+            if not hooks:
+                for branch in branches:
+                    self.spawn_branch(state, shared, branch)
+                continue
+
+            for branch in branches:
+
+                for h in hooks: await h.on_spawn_branch_start(state, shared, branch, node, branch_registry, self.join_registry)
 
                 self.spawn_branch(state, shared, branch)
 
-                for h in self.hooks: await h.on_spawn_branch_end(state, shared, branch, node, self.branch_registry, self.join_registry)
+                for h in hooks: await h.on_spawn_branch_end(state, shared, branch, node, branch_registry, self.join_registry)
     
     
             
     def spawn_branch(self, state: T, shared: S, branch: Branch[T, S]) -> None:
 
-        self.join_registry[branch.join].append(branch)
+        self.join_registry.setdefault(branch.join, []).append(branch)
 
-        self.task_group.create_task(self.run_branch(state, shared, branch))
+        # Created before the task, so a join can await the result also if the task has not started yet without eager tasks
+        branch.result = asyncio.get_running_loop().create_future()
+
+        # The branch gets its own state, because the spawning branch may change its state in place before the task starts
+        state_copy: T = fast_state_copy(state) if isinstance(state, BaseModel) else state.model_copy(deep=True)
+
+        self.task_group.create_task(self.run_branch(state_copy, shared, branch))
 
     async def join_branches(self, state: T, next_nodes: list[NextNode[T, S]]) -> T:
         """
@@ -419,14 +767,17 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
         changes: list[dict[tuple[Hashable, ...], Change]] = []
 
         for node in next_nodes:
-            for branch in self.join_registry[node.node]:
+
+            # Taken out of the registry before awaiting, branches that are spawned meanwhile join the next time
+            for branch in self.join_registry.pop(node.node, ()):
 
                 if branch.result is None:
                     raise ValueError(f"Branch {branch} has no result")
 
                 changes.append(await branch.result)
 
-                self.join_registry[node.node].remove(branch)
+        if not changes: # Most steps join no branch
+            return state
 
         state = await self.apply_changes(state, changes)
 
@@ -449,23 +800,30 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
            The list of the next nodes including their edges that they were reached by.
         """
 
-        next_list: list[NextNode[T, S]] = []
+        if self.types.is_single_source_list(current_nodes):
+            frontier = tuple(current_nodes)
 
-        if Types[T, S].is_single_source_list(current_nodes):
-            for current_node in current_nodes:
-                next_list.extend(
-                    await self.resolve_entries(state, shared, branch.edge_index[current_node])
-                )
-
-        elif Types[T, S].is_single_source(current_nodes):
-            next_list.extend(
-                await self.resolve_entries(state, shared, branch.edge_index[current_nodes])
-            )
+        elif self.types.is_single_source(current_nodes):
+            frontier = (current_nodes,)
         
         else:
             raise ValueError(f"Invalid current_nodes type: {type(current_nodes)}")
 
 
+        planned = branch.plan.get(frontier)
+
+        if planned is not None:
+            return list(planned)
+
+
+        entries = branch.frontier_entries(frontier)
+
+        next_list = await self.resolve_entries(state, shared, entries)
+
+        if all(node in branch.edge_index for node in frontier) and all(branch.is_plannable(entry) for entry in entries):
+            branch.plan[frontier] = list(next_list)
+
+
         # # Instant nodes
         # current_instant_next_list: list[NextNode[T, S]] = []
 
@@ -509,7 +867,7 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
 
         for e in eg.exceptions:            
 
-            print(traceback.format_exception(type(e), e, e.__traceback__))
+            logger.debug("Resolving next nodes for node exception", exc_info=e)
 
             source_node: NextNode[T, S] | None = getattr(e, "source_node", None)
 
@@ -517,22 +875,25 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
                 unhandled.append(e)
                 continue
 
-            entries: list[ErrorEntry[T, S]] = []
+            reached_index = source_node.reached_by.index
+            consumed: ErrorEntry[T, S] | None = None
 
-            for key in branch.error_edge_index.keys():
-                
-                if self.match_error(e, key, source_node):
-                    entries.extend(branch.error_edge_index[key])
+            # The error entries are sorted by index once when the branch is indexed
+            for key, entry in branch.error_entries:
 
-            entries.sort(key=lambda x: x.index)
-            for entry in entries:
-                if entry.index > source_node.reached_by.index: # If the error entry is after the node that raised the error
-                    next_nodes.extend(
-                        await self.resolve_entries(state, shared, [entry])
-                    )
+                if entry.index <= reached_index or entry is consumed: # Before the node that raised the error, or matched by another source of the same edge
+                    continue
+
+                if not self.match_error(e, key, source_node):
+                    continue
+
+                consumed = entry
+                next_nodes.extend(
+                    await self.resolve_entries(state, shared, [entry])
+                )
 
-                    if not entry.propagate:
-                        break
+                if not entry.propagate:
+                    break
             else: # Not consumed
                 unhandled.append(e)
 
@@ -546,19 +907,72 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
 
     def match_error(self, e: Exception, source: SingleErrorSource[T, S], source_node: NextNode[T, S]) -> bool:
 
-        match source:
-            case type(): # Exception type
-                return issubclass(type(e), source)
-            case (node, error_type): # (Node, Exception type)
-                return node == source_node.node and isinstance(e, error_type)
+        if isinstance(source, tuple): # (Node, Exception type)
+            node, error_type = source
+            return node == source_node.node and isinstance(e, error_type)
+
+        return isinstance(e, source) # Exception type
 
 
     async def resolve_entries(self, state: T, shared: S, entries: Sequence[Entries[T, S]]) -> list[NextNode[T, S]]:
-    
+        """
+        Resolve multiple entries.
+
+        Static nexts and synchronous callables are resolved directly.
+        The awaitables of the asynchronous callables are collected and awaited concurrently, so no task is created for entries that do not need one.
+
+        Make sure to call this method exactly ONCE per traversion of the edges, because callable edges are called.
+
+        Args:
+            state: The current state.
+            shared: The shared state.
+            entries: The entries to resolve.
+
+        Returns:
+            The resolved nodes in the order of the entries.
+        """
+
+        resolved: list[ResolvedNext[T, S]] = []
+        pending: list[tuple[int, Awaitable[ResolvedNext[T, S]]]] = []
+
+        try:
+
+            for entry in entries:
+
+                next = entry.next
+
+                if entry.callable_next:
+                    next = cast("Callable[[T, S], ResolvedNext[T, S] | Awaitable[ResolvedNext[T, S]]]", next)(state, shared)
+
+                    if entry.async_next or type(next) is CoroutineType or inspect.isawaitable(next): # Also synchronous callables returning an awaitable, e.g. a future
+                        pending.append((len(resolved), cast("Awaitable[ResolvedNext[T, S]]", next)))
+                        next = None
+
+                resolved.append(cast("ResolvedNext[T, S]", next))
+
+        except BaseException:
+
+            for _, awaitable in pending:
+                if type(awaitable) is CoroutineType:
+                    awaitable.close() # Never awaited
+
+            raise
+
+
+        if len(pending) == 1:
+            index, awaitable = pending[0]
+            resolved[index] = await awaitable
+
+        elif pending:
+            results = await asyncio.gather(*(awaitable for _, awaitable in pending))
+
+            for (index, _), result in zip(pending, results):
+                resolved[index] = result
+
         return [
-            next_node
-            for entry in entries
-            for next_node in await self.resolve_entry(state, shared, entry)
+            NextNode(node=node, reached_by=entry)
+            for entry, next in zip(entries, resolved)
+            for node in self.get_next_nodes(next)
         ]
 
 
@@ -576,55 +990,88 @@ class Graph[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol
             The resolved nodes.
         """
 
-        next = entry.next
+        return await self.resolve_entries(state, shared, [entry])
+    
 
-        if not Types[T, S].is_resolved_next(next):
-            if not Types[T, S].is_next(next):
-                raise ValueError(f"Invalid next type: {type(next)}")
-            
-            next = cast(Callable[[T, S], ResolvedNext[T, S]], next)
-            next = next(state, shared)
 
-            if inspect.isawaitable(next):
-                next = await next
-        
-        return [
-            NextNode[T, S](node=node, reached_by=entry)
-            for node in self.get_next_nodes(next)
-        ]
+    def get_next_nodes(self, next: ResolvedNext[T, S]) -> list[Node[T, S]]:
+
+        if self.types.is_node(next):
+            return [next]
+
+        if next is None:
+            return []
+
+        if self.types.is_single_next_list(next): # Validates every element to be a node or None
+            return [x for x in next if x is not None]
+
+        raise ValueError(f"Invalid next type: {type(next)}")
+                    
+                    
     
 
 
-    def get_next_nodes(self, next: ResolvedNext[T, S]) -> list[Node[T, S]]:
 
-        next_nodes: list[Node[T, S]] = []
+_eager_runs: WeakKeyDictionary[asyncio.AbstractEventLoop, int] = WeakKeyDictionary()
+"""
+The number of running graphs that share the eager task factory of a loop.
+"""
 
-        def match(x: SingleNext[T, S]) -> None:
 
-            match x:
+def _enter_eager(loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    Install the eager task factory on the loop for a graph run, unless the loop has a custom task factory.
 
-                case None:
-                    pass
-                
-                case Node():
-                    next_nodes.append(x)
+    Returns:
+        If the run has entered the eager mode and has to call `_exit_eager` when it finishes.
+    """
 
-                case _:
-                    raise ValueError(f"Invalid next type: {type(x)}")
+    runs = _eager_runs.get(loop, 0)
 
-        
-        if Types[T, S].is_single_next_list(next):
-            for x in next:
-                match(x)
+    if runs == 0:
+        if loop.get_task_factory() is not None:
+            return False
+        loop.set_task_factory(asyncio.eager_task_factory)
 
-        elif Types[T, S].is_single_next(next):
-            match(next)
+    _eager_runs[loop] = runs + 1
+    return True
 
-        else:
-            raise ValueError(f"Invalid next type: {type(next)}")
 
-        return next_nodes
-                    
-                    
-    
+def _exit_eager(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Remove the eager task factory when the last run on the loop finishes, unless it was replaced in the meantime.
+    """
+
+    runs = _eager_runs.pop(loop) - 1
+
+    if runs:
+        _eager_runs[loop] = runs
+    elif loop.get_task_factory() is asyncio.eager_task_factory:
+        loop.set_task_factory(None)
+
+
+@cache
+def _has_validators(cls: type[BaseModel]) -> bool:
+    """
+    Check if a model class has field or model validators, either as decorators or as annotated validators of its fields.
+    """
+
+    decorators = cls.__pydantic_decorators__
+
+    if decorators.field_validators or decorators.model_validators or decorators.root_validators or decorators.validators:
+        return True
+
+    return any(
+        isinstance(metadata, (AfterValidator, BeforeValidator, WrapValidator, PlainValidator))
+        for field in cls.model_fields.values()
+        for metadata in field.metadata
+    )
+
+
+@cache
+def _overrides_model_validate(cls: type[BaseModel]) -> bool:
+    """
+    Check if a model class overrides the `model_validate` classmethod of pydantic.
+    """
 
+    return cls.model_validate.__func__ is not BaseModel.model_validate.__func__
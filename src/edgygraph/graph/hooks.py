@@ -1,4 +1,3 @@
-from abc import ABC
 from collections.abc import Hashable
 
 from ..states import StateProtocol, SharedProtocol
@@ -8,12 +7,13 @@ from .types import BranchJoin, NextNode, SingleSource
 
 
 
-class GraphHook[T: StateProtocol, S: SharedProtocol](ABC):
+class GraphHook[T: StateProtocol, S: SharedProtocol]:
     """
     Hook for the graph execution.
 
     Hooks are called at different stages of the graph execution.
     They can be used to log, modify the state, or perform other actions.
+    All methods are optional, so only the needed ones have to be overridden.
     """
 
     async def on_graph_start(self, state: T, shared: S) -> None:
@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Callable, Awaitable, Any, TypeGuard, cast
+import inspect
+from functools import partial
+from types import BuiltinFunctionType, FunctionType, MethodType
+from typing import Callable, Awaitable, Any, NamedTuple, TypeGuard, cast
 from pydantic import BaseModel, ConfigDict, Field
 
 from ..states import StateProtocol, SharedProtocol
@@ -32,17 +35,52 @@ type BranchContainer[T: StateProtocol, S: SharedProtocol] = tuple[Source[T, S],
 # type SingleSourceBranchContainer[T: StateProtocol, S: SharedProtocol] = tuple[SingleBranchSource[T, S], NextWithConfig[T, S], *tuple[SourceWithConfig[T, S] | ErrorSource[T, S] | NextWithConfig[T, S], ...], BranchJoin[T, S]]
 
 
+def pure_edge[F: Callable[..., Any]](func: F) -> F:
+    """
+    Decorator to mark a callable next as pure.
+
+    A pure next returns the same result for every state and shared state.
+    It is only called the first time it is reached and its result is reused by the graph afterwards.
+
+    Args:
+        func: The callable next to mark.
+
+    Returns:
+        The same callable.
+    """
+
+    setattr(func, "__edgygraph_pure__", True)
+    return func
+
+
+_FUNCTION_TYPES: frozenset[type] = frozenset({FunctionType, MethodType, BuiltinFunctionType, partial})
+"""
+Callable types that can never be a source, so they are callable nexts without probing the source guards.
+"""
+
+
 class Types[T: StateProtocol, S: SharedProtocol]:
     """
     Typeguards for runtime typechecking.
     """
 
+    @classmethod
+    def is_node(cls, x: Any) -> TypeGuard[Node[T, S]]:
+        """
+        Check if x is a node.
+
+        Node is an ABC, so `isinstance` would go through `ABCMeta.__instancecheck__`.
+        The method resolution order of the class is checked directly instead, which is several times faster.
+        Virtual subclasses registered with `Node.register` are therefore not recognized as nodes.
+        """
+        return Node in type(x).__mro__
+
     @classmethod
     def is_node_with_config(cls, x: Any) -> TypeGuard[NodeWithConfig[T, S]]:
         return (
             isinstance(x, tuple) and
-            len(cast(tuple[Any], x)) == 2 and
-            isinstance(x[0], Node) and
+            len(cast("tuple[Any]", x)) == 2 and
+            cls.is_node(x[0]) and
             isinstance(x[1], NodeConfig)
         )
 
@@ -51,7 +89,7 @@ class Types[T: StateProtocol, S: SharedProtocol]:
     def is_single_next(cls, x: Any) -> TypeGuard[SingleNext[T, S]]:
         return (
             x is None or
-            isinstance(x, Node)
+            cls.is_node(x)
         )
     
     @classmethod
@@ -63,11 +101,11 @@ class Types[T: StateProtocol, S: SharedProtocol]:
     
     @classmethod
     def is_single_next_list(cls, x: Any) -> TypeGuard[list[SingleNext[T, S]]]:
-        return isinstance(x, list) and all(cls.is_single_next(n) for n in cast(list[Any], x))
+        return isinstance(x, list) and all(map(cls.is_single_next, cast("list[Any]", x)))
     
     @classmethod
     def is_single_next_with_config_list(cls, x: Any) -> TypeGuard[list[SingleNextWithConfig[T, S]]]:
-        return isinstance(x, list) and all(cls.is_single_next_with_config(n) for n in cast(list[Any], x))
+        return isinstance(x, list) and all(map(cls.is_single_next_with_config, cast("list[Any]", x)))
     
     @classmethod
     def is_resolved_next(cls, x: Any) -> TypeGuard[ResolvedNext[T, S]]:
@@ -85,12 +123,19 @@ class Types[T: StateProtocol, S: SharedProtocol]:
     
     @classmethod
     def is_next_callable(cls, x: Any) -> TypeGuard[Callable[[T, S], ResolvedNext[T, S]] | Callable[[T, S], Awaitable[ResolvedNext[T, S]]]]:
+        if type(x) in _FUNCTION_TYPES:
+            return True
         return callable(x) and not (
             cls.is_any_source(x) or # includes Node, START, Exceptions
             x is END
         )
     
 
+    @classmethod
+    def is_pure_next_callable(cls, x: Any) -> TypeGuard[Callable[[T, S], ResolvedNext[T, S]] | Callable[[T, S], Awaitable[ResolvedNext[T, S]]]]:
+        return cls.is_next_callable(x) and getattr(x, "__edgygraph_pure__", False) is True
+    
+
     @classmethod
     def is_next(cls, x: Any) -> TypeGuard[Next[T, S]]:
         return (
@@ -108,7 +153,7 @@ class Types[T: StateProtocol, S: SharedProtocol]:
     @classmethod
     def is_single_source(cls, x: Any) -> TypeGuard[SingleSource[T, S]]:
         return (
-            isinstance(x, Node) or
+            cls.is_node(x) or
             x is START
         )
     
@@ -118,11 +163,11 @@ class Types[T: StateProtocol, S: SharedProtocol]:
 
     @classmethod
     def is_single_source_list(cls, x: Any) -> TypeGuard[list[SingleSource[T, S]]]:
-        return isinstance(x, list) and all(cls.is_single_source(n) for n in cast(list[Any], x))
+        return isinstance(x, list) and all(map(cls.is_single_source, cast("list[Any]", x)))
     
     @classmethod
     def is_single_source_with_config_list(cls, x: Any) -> TypeGuard[list[SingleSourceWithConfig[T, S]]]:
-        return isinstance(x, list) and all(cls.is_single_source_with_config(n) for n in cast(list[Any], x))
+        return isinstance(x, list) and all(map(cls.is_single_source_with_config, cast("list[Any]", x)))
 
     @classmethod
     def is_source(cls, x: Any) -> TypeGuard[Source[T, S]]:
@@ -142,12 +187,12 @@ class Types[T: StateProtocol, S: SharedProtocol]:
     def is_single_error_source(cls, x: Any) -> TypeGuard[SingleErrorSource[T, S]]:
         return (
             (isinstance(x, type) and issubclass(x, Exception)) or
-            (isinstance(x, tuple) and len(cast(tuple[Any], x)) == 2 and isinstance(x[0], Node) and isinstance(x[1], type) and issubclass(x[1], Exception))
+            (isinstance(x, tuple) and len(cast("tuple[Any]", x)) == 2 and cls.is_node(x[0]) and isinstance(x[1], type) and issubclass(x[1], Exception))
         )
     
     @classmethod
     def is_single_error_source_list(cls, x: Any) -> TypeGuard[list[SingleErrorSource[T, S]]]:
-        return isinstance(x, list) and all(cls.is_single_error_source(n) for n in cast(list[Any], x))
+        return isinstance(x, list) and all(map(cls.is_single_error_source, cast("list[Any]", x)))
     
     @classmethod
     def is_error_source(cls, x: Any) -> TypeGuard[ErrorSource[T, S]]:
@@ -177,7 +222,7 @@ class Types[T: StateProtocol, S: SharedProtocol]:
 
     @classmethod
     def is_any_single_source_list(cls, x: Any) -> TypeGuard[list[SingleSourceWithConfig[T, S] | SingleErrorSource[T, S]]]:
-        return isinstance(x, list) and all(cls.is_any_single_source(n) for n in cast(list[Any], x))
+        return isinstance(x, list) and all(map(cls.is_any_single_source, cast("list[Any]", x)))
     
     @classmethod
     def is_any_source(cls, x: Any) -> TypeGuard[SourceWithConfig[T, S] | ErrorSource[T, S]]:
@@ -237,25 +282,41 @@ class ErrorEdge[T: StateProtocol, S: SharedProtocol](BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
-class BaseEntry[T: StateProtocol, S: SharedProtocol](BaseModel):
+class BaseEntry[T: StateProtocol, S: SharedProtocol]:
     """
     Base class for the values of edge indexing dictionaries of a branch.
 
     Do not instantiate directly.
 
+    The kind of the next is classified once on construction, so resolving the entry does not need to inspect it again.
+    Entries are only created by the branch from already checked edges, so they are slotted classes instead of validated models.
+
     Attributes:
         next: The unresolved targets of the edge.
         index: The original index of the entry in the list of edges of the branch.
+        callable_next: If the next is a callable. Set automatically.
+        async_next: If the next is a coroutine function. Set automatically.
     """
 
-    next: Next[T, S]
-    index: int
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    __slots__ = ("next", "index", "callable_next", "async_next")
+
+    def __init__(self, next: Next[T, S], index: int) -> None:
 
-    def model_post_init(self, __context: Any):
         if type(self) is BaseEntry:
             raise Exception("BaseEntry is not meant to be instantiated directly.") # Safeguard
 
+        self.next = next
+        self.index = index
+
+        self.callable_next = Types[T, S].is_next_callable(next)
+        self.async_next = self.callable_next and (
+            inspect.iscoroutinefunction(next) or
+            inspect.iscoroutinefunction(getattr(next, "__call__", None))
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(next={self.next!r}, index={self.index!r})"
+
 
 class Entry[T: StateProtocol, S: SharedProtocol](BaseEntry[T, S]):
     """
@@ -266,6 +327,8 @@ class Entry[T: StateProtocol, S: SharedProtocol](BaseEntry[T, S]):
         index: The original index of the entry in the list of edges.
     """
 
+    __slots__ = ()
+
 class ErrorEntry[T: StateProtocol, S: SharedProtocol](BaseEntry[T, S]):
     """
     A value of the error edge indexing dictionary of a branch.
@@ -276,17 +339,23 @@ class ErrorEntry[T: StateProtocol, S: SharedProtocol](BaseEntry[T, S]):
         propagate: If the error should be reraised. If False, the error is caught and the graph continues.
     """
 
-    propagate: bool = Field(default=False)
+    __slots__ = ("propagate",)
+
+    def __init__(self, next: Next[T, S], index: int, propagate: bool = False) -> None:
+        super().__init__(next=next, index=index)
+        self.propagate = propagate
     # config: ErrorConfig = Field(default_factory=ErrorConfig)
 
 
 type Entries[T: StateProtocol, S: SharedProtocol] = Entry[T, S] | ErrorEntry[T, S]
 
 
-class NextNode[T: StateProtocol, S: SharedProtocol](BaseModel):
+class NextNode[T: StateProtocol, S: SharedProtocol](NamedTuple):
     """
     A node that is the target of an edge.
 
+    Next nodes are created for every step, so they are lightweight named tuples instead of validated models.
+
     Attributes:
         node: The node.
         reached_by: The edge that targeted this node.
@@ -294,4 +363,3 @@ class NextNode[T: StateProtocol, S: SharedProtocol](BaseModel):
 
     node: Node[T, S]
     reached_by: Entries[T, S]
-    model_config = ConfigDict(arbitrary_types_allowed=True)
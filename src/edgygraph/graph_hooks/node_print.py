@@ -30,5 +30,6 @@ class NodePrintHook[T: StateProtocol = StateProtocol, S: SharedProtocol = Shared
         self.renderer.render_graph_end(state, shared)
 
     async def on_spawn_branch_end(self, state: T, shared: S, branch: Branch[T, S], trigger: NextNode[T, S], branch_registry: dict[SingleSource[T, S], list[Branch[T, S]]], join_registry: dict[BranchJoin[T, S], list[Branch[T, S]]]):
-        self.renderer.render_spawn_branch_end(branch, trigger)
-        self.renderer.render_branch_overview(branch_registry, join_registry)
\ No newline at end of file
+        with self.renderer.batched():
+            self.renderer.render_spawn_branch_end(branch, trigger)
+            self.renderer.render_branch_overview(branch_registry, join_registry)
\ No newline at end of file
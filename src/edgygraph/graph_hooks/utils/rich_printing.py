@@ -1,19 +1,32 @@
-from collections.abc import Hashable
+from collections.abc import Generator, Hashable
+from contextlib import contextmanager
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.table import Table
 from rich.columns import Columns
 from rich.pretty import Pretty
 from rich.rule import Rule
+from rich.text import Text
 from rich.tree import Tree
 
 from ...diff import Change, ChangeTypes
+from ...nodes import START, END
 from ...graph.types import NextNode, BranchJoin, SingleSource
 from ...graph.branches import Branch
 from ...states import StateProtocol as State, SharedProtocol as Shared
 
 
+_CHANGE_COLORS: dict[ChangeTypes, str] = {
+    ChangeTypes.ADDED: "green",
+    ChangeTypes.REMOVED: "red",
+    ChangeTypes.UPDATED: "blue",
+}
+"""
+The colors of the change types in the merge result.
+"""
+
+
 class GraphRenderer[T: State, S: Shared]:
     """
     A reusable Rich-based renderer for graph execution state.
@@ -21,38 +34,61 @@ class GraphRenderer[T: State, S: Shared]:
     Provides methods to render state snapshots, step info, merge results,
     and other graph lifecycle events. Can be used by hooks like
     InteractiveDebugHook or LoggingHook without duplicating display logic.
+
+    Every render method prints its renderables as one group, so the console renders and writes only once per call.
+    If the console is quiet, the render methods return without building any renderables.
+
+    Args:
+        console: The console to print to. If not provided, a new console will be created.
+        max_depth: The maximum depth of nested values in the state renderings. Unlimited if None.
+        max_length: The maximum number of items of containers in the state renderings. Unlimited if None.
     """
 
-    def __init__(self, console: Console | None = None) -> None:
+    def __init__(self, console: Console | None = None, max_depth: int | None = None, max_length: int | None = None) -> None:
         self.console = console or Console()
+        self.max_depth = max_depth
+        self.max_length = max_length
 
     # -------------------------------------------------------------------------
     # Graph lifecycle
     # -------------------------------------------------------------------------
 
     def render_graph_start(self, state: T, shared: S) -> None:
-        self.console.print(Rule("[bold magenta]Graph Execution Started", style="magenta"))
-        self.console.print(Columns([
-            Panel(Pretty(state), title="Initial State", border_style="blue"),
-            Panel(Pretty(shared), title="Initial Shared", border_style="cyan"),
-        ]))
+        if self.console.quiet:
+            return
+
+        self.console.print(Group(
+            Rule("[bold magenta]Graph Execution Started", style="magenta"),
+            Columns([
+                Panel(self._pretty(state), title="Initial State", border_style="blue"),
+                Panel(self._pretty(shared), title="Initial Shared", border_style="cyan"),
+            ]),
+        ))
 
     def render_graph_end(self, state: T, shared: S) -> None:
-        self.console.print(Rule("[bold green]Graph Execution Finished", style="green"))
+        if self.console.quiet:
+            return
+
         # self.console.print(Panel(Pretty(state), title="Final State", border_style="green"))
-        self.console.print(Columns([
-            Panel(Pretty(state), title="Final State", border_style="blue"),
-            Panel(Pretty(shared), title="Final Shared", border_style="cyan"),
-        ]))
+        self.console.print(Group(
+            Rule("[bold green]Graph Execution Finished", style="green"),
+            Columns([
+                Panel(self._pretty(state), title="Final State", border_style="blue"),
+                Panel(self._pretty(shared), title="Final Shared", border_style="cyan"),
+            ]),
+        ))
 
     # -------------------------------------------------------------------------
     # Step lifecycle
     # -------------------------------------------------------------------------
 
     def render_step_start(self, nodes: list[NextNode[T, S]]) -> None:
+        if self.console.quiet:
+            return
+
         node_tree = Tree("[bold yellow]Next Step Nodes")
         for node in nodes:
-            node_tree.add(f"[green]{node.node.__class__.__name__}[/green]")
+            node_tree.add(Text(type(node.node).__name__, style="green"))
 
         self.console.print(Panel(
             node_tree,
@@ -62,31 +98,33 @@ class GraphRenderer[T: State, S: Shared]:
         ))
 
     def render_step_end_rule(self, nodes: list[NextNode[T, S]]) -> None:
-        node_names = self._node_names(nodes)
-        self.console.print(Rule(f"[bold blue]Step Completed: {node_names}", style="blue"))
+        if self.console.quiet:
+            return
+
+        self.console.print(self._step_end_rule(self._node_names(nodes)))
 
     def render_step_end_footer(self, nodes: list[NextNode[T, S]]) -> None:
-        node_names = self._node_names(nodes)
-        self.console.print(f"[dim]Finished executing: {node_names}[/dim]")
+        if self.console.quiet:
+            return
+
+        self.console.print(self._step_end_footer(self._node_names(nodes)))
 
 
     def render_step_end(self, state: T, shared: S, nodes: list[NextNode[T, S]]) -> None:
-        self.render_step_end_rule(nodes)
+        if self.console.quiet:
+            return
 
-        table = Table(
-            title="Post-Step Snapshot",
-            show_header=True,
-            header_style="bold cyan",
-            expand=True,
-            border_style="dim",
-        )
-        table.add_column("Category", style="bold", width=12)
-        table.add_column("Content", justify="left")
-        table.add_row("STATE", Panel(Pretty(state), border_style="green", title="State"))
-        table.add_row("SHARED", Panel(Pretty(shared), border_style="yellow", title="Shared State"))
+        node_names = self._node_names(nodes)
 
-        self.console.print(table)
-        self.render_step_end_footer(nodes)
+        table = self._build_snapshot_table()
+        table.add_row("STATE", Panel(self._pretty(state), border_style="green", title="State"))
+        table.add_row("SHARED", Panel(self._pretty(shared), border_style="yellow", title="Shared State"))
+
+        self.console.print(Group(
+            self._step_end_rule(node_names),
+            table,
+            self._step_end_footer(node_names),
+        ))
 
     # -------------------------------------------------------------------------
     # Merge lifecycle
@@ -96,12 +134,15 @@ class GraphRenderer[T: State, S: Shared]:
         self,
         conflicts: dict[tuple[Hashable, ...], list[Change]],
     ) -> None:
-        self.console.print(Panel(
+        if self.console.quiet:
+            return
+
+        renderables: list[RenderableType] = [Panel(
             f"[bold white]Conflict detected in {len(conflicts)} property path(s)![/]",
             title="ERROR: MERGE CONFLICT",
             style="on red",
             expand=True,
-        ))
+        )]
 
         for path, change_list in conflicts.items():
             table = Table(title=f"Conflict at: [bold yellow]{path}[/]", show_lines=True)
@@ -110,20 +151,24 @@ class GraphRenderer[T: State, S: Shared]:
             table.add_column("Proposed Value", ratio=1)
 
             for i, change in enumerate(change_list):
-                table.add_row(f"#{i}", str(change.type), Pretty(change.new))
+                table.add_row(f"#{i}", str(change.type), self._pretty(change.new))
 
-            self.console.print(table)
+            renderables.append(table)
 
-        self.console.print("[bold red]Note:[/bold red] The graph cannot merge these branches automatically.")
+        renderables.append("[bold red]Note:[/bold red] The graph cannot merge these branches automatically.")
+        self.console.print(Group(*renderables))
 
     def render_merge_end(
         self,
         changes: list[dict[tuple[Hashable, ...], Change]],
     ) -> None:
-        self.console.print(Rule("[bold cyan]Merge Result", style="cyan"))
+        if self.console.quiet:
+            return
+
+        rule = Rule("[bold cyan]Merge Result", style="cyan")
 
         if not any(changes):
-            self.console.print("[dim italic]No changes detected.[/dim italic]")
+            self.console.print(Group(rule, "[dim italic]No changes detected.[/dim italic]"))
             return
 
         table = Table(show_lines=True, expand=True)
@@ -133,25 +178,21 @@ class GraphRenderer[T: State, S: Shared]:
 
         for idx, change_dict in enumerate(changes):
             for path, change in change_dict.items():
-                color = (
-                    "green" if change.type == ChangeTypes.ADDED
-                    else "red" if change.type == ChangeTypes.REMOVED
-                    else "blue"
-                )
+                color = _CHANGE_COLORS[change.type]
 
-                diff_view = Tree(f"[bold {color}]{change.type.upper()}[/bold {color}]")
+                diff_view = Tree(Text(change.type.upper(), style=f"bold {color}"))
                 if change.type != ChangeTypes.ADDED:
-                    diff_view.add(Panel(Pretty(change.old), title="old", border_style="red", expand=False))
+                    diff_view.add(Panel(self._pretty(change.old), title="old", border_style="red", expand=False))
                 if change.type != ChangeTypes.REMOVED:
-                    diff_view.add(Panel(Pretty(change.new), title="new", border_style="green", expand=False))
+                    diff_view.add(Panel(self._pretty(change.new), title="new", border_style="green", expand=False))
 
                 table.add_row(
-                    f"{path}\n[dim]Branch {idx}[/dim]",
-                    f"[{color}]{change.type}[/]",
+                    Text.assemble(f"{path}\n", (f"Branch {idx}", "dim")),
+                    Text(change.type, style=color),
                     diff_view,
                 )
 
-        self.console.print(table)
+        self.console.print(Group(rule, table))
 
 
     # -------------------------------------------------------------------------
@@ -168,48 +209,49 @@ class GraphRenderer[T: State, S: Shared]:
         Render information after a branch has been spawned.
         """
 
+        if self.console.quiet:
+            return
+
         # Titelbaum
         tree = Tree("[bold magenta]Branch Spawned")
 
         # Trigger Node
-        trigger_name = trigger.node.__class__.__name__
-        tree.add(f"[yellow]Triggered by:[/yellow] [green]{trigger_name}[/green]")
+        trigger_name = type(trigger.node).__name__
+        tree.add(Text.assemble(("Triggered by:", "yellow"), " ", (trigger_name, "green")))
 
         # Join Info
         if branch.join is None:
-            join_label = "[dim]No Join (detached branch)[/dim]"
-        elif isinstance(branch.join, type):
-            join_label = "[red]END[/red]"
+            join_label = ("No Join (detached branch)", "dim")
+        elif branch.join is END:
+            join_label = ("END", "red")
         else:
-            join_label = f"[cyan]{branch.join.__class__.__name__}[/cyan]"
+            join_label = (type(branch.join).__name__, "cyan")
 
-        tree.add(f"[yellow]Join Target:[/yellow] {join_label}")
+        tree.add(Text.assemble(("Join Target:", "yellow"), " ", join_label))
 
         # Edge Übersicht
         edge_info = Tree("[bold]Branch Edges")
         for source, entries in branch.edge_index.items():
             source_name = (
-                "START" if isinstance(source, type)
-                else source.__class__.__name__
+                "START" if source is START
+                else type(source).__name__
             )
 
-            source_node = edge_info.add(f"[blue]{source_name}[/blue]")
+            source_node = edge_info.add(Text(source_name, style="blue"))
 
             for entry in entries:
                 next_repr = entry.next
-                if isinstance(next_repr, type):
+                if next_repr is END:
                     next_label = "END"
                 elif next_repr is None:
                     next_label = "None"
-                elif hasattr(next_repr, "__class__"):
-                    next_label = getattr(next_repr, "__class__", type(next_repr)).__name__
                 else:
-                    next_label = str(next_repr)
+                    next_label = type(next_repr).__name__
 
-                source_node.add(
-                    f"[dim]->[/dim] {next_label} "
-                    f"[dim](idx={entry.index})[/dim]"
-                )
+                source_node.add(Text.assemble(
+                    ("->", "dim"), f" {next_label} ",
+                    (f"(idx={entry.index})", "dim"),
+                ))
 
         tree.add(edge_info)
 
@@ -231,6 +273,9 @@ class GraphRenderer[T: State, S: Shared]:
         Render a combined overview of branch_registry and join_registry.
         """
 
+        if self.console.quiet:
+            return
+
         # ================================================================
         # LEFT: Branch Registry (Spawn Sources)
         # ================================================================
@@ -241,29 +286,29 @@ class GraphRenderer[T: State, S: Shared]:
 
         for source, branches in branch_registry.items():
             source_name = (
-                "START" if isinstance(source, type)
-                else source.__class__.__name__
+                "START" if source is START
+                else type(source).__name__
             )
 
             total_branches += len(branches)
 
-            source_node = branch_tree.add(
-                f"[blue]{source_name}[/blue] "
-                f"[dim]({len(branches)} branches)[/dim]"
-            )
+            source_node = branch_tree.add(Text.assemble(
+                (source_name, "blue"), " ",
+                (f"({len(branches)} branches)", "dim"),
+            ))
 
             for i, b in enumerate(branches):
                 if b.join is None:
                     join_name = "None"
-                elif isinstance(b.join, type):
+                elif b.join is END:
                     join_name = "END"
                 else:
-                    join_name = b.join.__class__.__name__
+                    join_name = type(b.join).__name__
 
-                source_node.add(
-                    f"[magenta]Branch#{i}[/magenta] "
-                    f"[dim]-> join:[/dim] [cyan]{join_name}[/cyan]"
-                )
+                source_node.add(Text.assemble(
+                    (f"Branch#{i}", "magenta"), " ",
+                    ("-> join:", "dim"), " ", (join_name, "cyan"),
+                ))
 
         if total_branches == 0:
             branch_tree.add("[dim]No active branches[/dim]")
@@ -282,19 +327,19 @@ class GraphRenderer[T: State, S: Shared]:
                 continue
 
             target_name = (
-                "END" if isinstance(target, type)
-                else target.__class__.__name__
+                "END" if target is END
+                else type(target).__name__
             )
 
             total_waiting += len(branches)
 
-            target_node = join_tree.add(
-                f"[cyan]{target_name}[/cyan] "
-                f"[dim]({len(branches)} waiting)[/dim]"
-            )
+            target_node = join_tree.add(Text.assemble(
+                (target_name, "cyan"), " ",
+                (f"({len(branches)} waiting)", "dim"),
+            ))
 
             for i, _ in enumerate(branches):
-                target_node.add(f"[magenta]Branch#{i}[/magenta]")
+                target_node.add(Text(f"Branch#{i}", style="magenta"))
 
         if total_waiting == 0:
             join_tree.add("[dim]No branches waiting for join[/dim]")
@@ -327,8 +372,43 @@ class GraphRenderer[T: State, S: Shared]:
     # Generic helpers
     # -------------------------------------------------------------------------
 
+    @contextmanager
+    def batched(self) -> Generator[None]:
+        """
+        Buffers everything rendered inside the context and writes it to the console at once on exit.
+
+        Use it around consecutive render calls, so they produce a single write instead of one per call.
+        """
+
+        with self.console:
+            yield
+
     def render_rule(self, title: str = "", style: str = "dim") -> None:
+        if self.console.quiet:
+            return
+
         self.console.print(Rule(title, style=style))
 
     def _node_names(self, nodes: list[NextNode[T, S]]) -> str:
-        return ", ".join(n.node.__class__.__name__ for n in nodes)
\ No newline at end of file
+        return ", ".join([type(n.node).__name__ for n in nodes])
+
+    def _step_end_rule(self, node_names: str) -> Rule:
+        return Rule(f"[bold blue]Step Completed: {node_names}", style="blue")
+
+    def _step_end_footer(self, node_names: str) -> str:
+        return f"[dim]Finished executing: {node_names}[/dim]"
+
+    def _pretty(self, obj: object) -> Pretty:
+        return Pretty(obj, max_depth=self.max_depth, max_length=self.max_length)
+
+    def _build_snapshot_table(self) -> Table:
+        table = Table(
+            title="Post-Step Snapshot",
+            show_header=True,
+            header_style="bold cyan",
+            expand=True,
+            border_style="dim",
+        )
+        table.add_column("Category", style="bold", width=12)
+        table.add_column("Content", justify="left")
+        return table
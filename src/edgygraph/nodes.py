@@ -2,7 +2,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from copy import copy
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, Sequence
 from importlib import metadata
 
 from .states import StateProtocol, SharedProtocol
@@ -101,6 +101,29 @@ class Node[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol]
         """
         return (self, NodeConfig(operator="pos"))
 
+class FusedNode[T: StateProtocol = StateProtocol, S: SharedProtocol = SharedProtocol](Node[T, S]):
+    """
+    Represents a linear chain of nodes that is run as a single node.
+
+    The nodes are run one after another on the same state, so the state is only copied and merged once for the whole chain.
+    Fused nodes are created by the graph when it is compiled and are not meant to be used in edges.
+
+    Attributes:
+        nodes: The nodes of the chain in the order they are run.
+    """
+
+    def __init__(self, nodes: Sequence[Node[T, S]]) -> None:
+        super().__init__()
+        self.nodes = tuple(nodes)
+
+    async def __call__(self, state: T, shared: S) -> None:
+        for node in self.nodes:
+            await node(state, shared)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.nodes))})"
+
+
 class START:
     """
     Represents a start node
@@ -1,5 +1,28 @@
+from typing import Any, Iterable, Iterator
 from pydantic import Field, BaseModel
 
+
+def truncated_rich_repr(values: Iterable[tuple[str, Any]], max_chars_per_value: int) -> Iterator[tuple[str, Any]]:
+    """
+    Yields the rich representation of named values and replaces values that exceed the length limit.
+
+    Args:
+        values: The names and values to represent.
+        max_chars_per_value: The maximum number of characters to display for each value.
+
+    Returns:
+        The names and the values or ```<object of length: {len(str(value))}>``` if a value exceeds the limit.
+    """
+
+    for name, value in values:
+        length = len(str(value))
+
+        if length > max_chars_per_value:
+            yield name, f"<object of length: {length}>"
+        else:
+            yield name, value
+
+
 class RichReprMixin(BaseModel):
     """
     Mixin to limit the length of values in the rich representation of a Pydantic model.
@@ -11,17 +34,13 @@ class RichReprMixin(BaseModel):
 
     MAX_CHARS_PER_VALUE: int = Field(default=2000, exclude=True)
 
-    def __rich_repr__(self):
-
-        for name, field_info in self.__class__.model_fields.items():
-            
-            if field_info.exclude:
-                continue
-
-            value = getattr(self, name)
-            length = len(str(value))
+    def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
 
-            if length > self.MAX_CHARS_PER_VALUE:
-                yield name, f"<object of length: {len(str(value))}>"
-            else:
-                yield name, value
\ No newline at end of file
+        yield from truncated_rich_repr(
+            (
+                (name, getattr(self, name))
+                for name, field_info in self.__class__.model_fields.items()
+                if not field_info.exclude
+            ),
+            self.MAX_CHARS_PER_VALUE,
+        )
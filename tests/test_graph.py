@@ -1,10 +1,20 @@
 import pytest
 import asyncio
+import io
+import pickle
+from pydantic import ConfigDict, Field, ValidationError, field_validator
 from asyncio import Lock
-from collections.abc import Hashable
-
-from edgygraph import Graph, Node, State, Shared, START, END
+from collections.abc import Generator, Hashable, Mapping
+from typing import Any, ClassVar, Self
+from rich.console import Console
+
+from edgygraph import Graph, Node, State, Shared, START, END, pure_edge
+from edgygraph.nodes import FusedNode
+from edgygraph.graph.types import Types, NextNode
+from edgygraph.graph.hooks import GraphHook
 from edgygraph.diff import ChangeTypes, Diff, Change, ChangeConflictException
+from edgygraph.fastcopy import fast_state_copy
+from edgygraph.graph_hooks.utils.rich_printing import GraphRenderer
 
 
 
@@ -21,6 +31,12 @@ class SimpleState(State):
 class SimpleShared(Shared):
     pass
 
+class NestedState(State):
+    items: list[int] = []
+    mapping: dict[str, list[int]] = {}
+    inner: SimpleState = SimpleState()
+    label: str = "label"
+
 
 class IncrementNode(Node[SimpleState, SimpleShared]):
     async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
@@ -98,6 +114,89 @@ class TestDiffRecursiveDiff:
         assert changes[()].type == ChangeTypes.UPDATED
 
 
+    def test_dict_replaced_by_scalar(self):
+        changes = Diff.recursive_diff({"a": {"b": 1}}, {"a": 1})
+        assert changes == {("a",): Change(type=ChangeTypes.UPDATED, old={"b": 1}, new=1)}
+
+    def test_deeply_nested_dicts(self):
+        old: dict[str, object] = {}
+        new: dict[str, object] = {}
+        cursor_old, cursor_new = old, new
+        for _ in range(5000):
+            cursor_old["k"] = cursor_old = {}
+            cursor_new["k"] = cursor_new = {}
+        cursor_new["leaf"] = 1
+        changes = Diff.recursive_diff(old, new)
+        assert len(changes) == 1
+        assert next(iter(changes.values())).type == ChangeTypes.ADDED
+        assert next(iter(changes)) == ("k",) * 5000 + ("leaf",)
+
+
+    def test_same_object_has_no_changes(self):
+        d = {"a": {"b": 1}}
+        assert Diff.recursive_diff(d, d) == {}
+
+    def test_paths_start_with_given_path(self):
+        changes = Diff.recursive_diff({"a": {"b": {"c": 1}}, "d": 1}, {"a": {"b": {"c": 2}}}, ("root",))
+        assert set(changes) == {("root", "a", "b", "c"), ("root", "d")}
+
+    def test_identical_subtrees_are_skipped(self):
+        class Uncomparable:
+            def __eq__(self, other: object) -> bool:
+                raise AssertionError("compared")
+
+        shared = {"leaf": Uncomparable()}
+        changes = Diff.recursive_diff({"shared": shared, "a": 1}, {"shared": shared, "a": 2})
+        assert set(changes) == {("a",)}
+
+
+class TestDiffRecursiveDiffModels:
+    def test_matches_model_dump_diff(self):
+        old = NestedState(items=[1], mapping={"a": [1]}, inner=SimpleState(value=1))
+        new = NestedState(items=[1, 2], mapping={"a": [1], "b": [2]}, inner=SimpleState(value=2), label="new")
+        assert Diff.recursive_diff_models(old, new) == Diff.recursive_diff(old.model_dump(), new.model_dump())
+
+    def test_excluded_fields_are_ignored(self):
+        class ExcludingState(State):
+            value: int = 0
+            hidden: int = Field(default=0, exclude=True)
+
+        changes = Diff.recursive_diff_models(ExcludingState(), ExcludingState(value=1, hidden=1))
+        assert set(changes) == {("value",)}
+
+    def test_extra_fields_are_compared(self):
+        class ExtraState(State):
+            model_config = ConfigDict(extra="allow")
+
+        changes = Diff.recursive_diff_models(ExtraState(), ExtraState.model_validate({"added": 1}))
+        assert changes == {("added",): Change(type=ChangeTypes.ADDED, old=None, new=1)}
+
+
+    def test_model_on_one_side_is_recorded_as_model(self):
+        class OptionalInner(State):
+            inner: NestedState | None = None
+
+        new = OptionalInner(inner=NestedState(items=[1]))
+
+        changes = Diff.recursive_diff_models(OptionalInner(), new)
+        assert set(changes) == {("inner",)}
+        assert changes[("inner",)].old is None
+        assert changes[("inner",)].new is new.inner
+
+        changes = Diff.recursive_diff_models(new, OptionalInner())
+        assert changes[("inner",)].old is new.inner
+        assert changes[("inner",)].new is None
+
+    def test_model_replaced_by_scalar(self):
+        class InnerOrNumber(State):
+            inner: SimpleState | int = 0
+
+        old = InnerOrNumber(inner=SimpleState(value=1))
+
+        changes = Diff.recursive_diff_models(old, InnerOrNumber(inner=3))
+        assert changes == {("inner",): Change(type=ChangeTypes.UPDATED, old=old.inner, new=3)}
+        assert changes[("inner",)].old is old.inner
+
 class TestDiffFindConflicts:
     def test_no_conflict_single_change(self):
         c: list[dict[tuple[Hashable, ...], Change]] = [{("a",): Change(type=ChangeTypes.UPDATED, old=1, new=2)}]
@@ -123,6 +222,31 @@ class TestDiffFindConflicts:
     def test_empty_changes(self):
         assert Diff.find_conflicts([]) == {}
 
+    def test_conflicts_keep_order_of_changes(self):
+        first = Change(type=ChangeTypes.UPDATED, old=0, new=1)
+        second = Change(type=ChangeTypes.REMOVED, old=0, new=None)
+        third = Change(type=ChangeTypes.UPDATED, old=0, new=3)
+        c: list[dict[tuple[Hashable, ...], Change]] = [
+            {("a",): first, ("b",): first},
+            {("c",): second},
+            {("a",): third},
+        ]
+        assert Diff.find_conflicts(c) == {("a",): [first, third]}
+
+
+class TestChange:
+    def test_fields(self):
+        change = Change(type=ChangeTypes.UPDATED, old=1, new=2)
+        assert (change.type, change.old, change.new) == (ChangeTypes.UPDATED, 1, 2)
+        assert change == Change(ChangeTypes.UPDATED, 1, 2)
+
+    def test_has_no_instance_dict(self):
+        assert not hasattr(Change(type=ChangeTypes.ADDED, old=None, new=1), "__dict__")
+
+    def test_rich_repr_truncates_long_values(self):
+        change = Change(type=ChangeTypes.ADDED, old=None, new="x" * (Change.MAX_CHARS_PER_VALUE + 1))
+        assert dict(change.__rich_repr__())["new"] == f"<object of length: {Change.MAX_CHARS_PER_VALUE + 1}>"
+
 
 class TestDiffApplyChanges:
     def test_apply_update(self):
@@ -149,12 +273,30 @@ class TestDiffApplyChanges:
         Diff.apply_changes(target, changes)
         assert target["a"]["b"] == 42
 
+    def test_apply_sibling_changes_under_new_parent(self):
+        target: dict[Hashable, object] = {"a": {"keep": 0, "drop": 1}}
+        changes: dict[tuple[Hashable, ...], Change] = {
+            ("a", "drop"): Change(type=ChangeTypes.REMOVED, old=1, new=None),
+            ("b", "c", "x"): Change(type=ChangeTypes.ADDED, old=None, new=1),
+            ("a", "keep"): Change(type=ChangeTypes.UPDATED, old=0, new=2),
+            ("b", "c", "y"): Change(type=ChangeTypes.ADDED, old=None, new=2),
+        }
+        Diff.apply_changes(target, changes)
+        assert target == {"a": {"keep": 2}, "b": {"c": {"x": 1, "y": 2}}}
+
     def test_remove_missing_key_raises(self):
         target: dict[Hashable, int] = {}
         changes: dict[tuple[Hashable, ...], Change] = {("missing",): Change(type=ChangeTypes.REMOVED, old=1, new=None)}
         with pytest.raises(KeyError):
             Diff.apply_changes(target, changes)
 
+    def test_remove_under_missing_parent_raises_without_creating_it(self):
+        target: dict[Hashable, object] = {}
+        changes: dict[tuple[Hashable, ...], Change] = {("missing", "key"): Change(type=ChangeTypes.REMOVED, old=1, new=None)}
+        with pytest.raises(KeyError):
+            Diff.apply_changes(target, changes)
+        assert target == {}
+
 
 # ===========================================================================
 # Tests: Graph – basic execution
@@ -201,6 +343,197 @@ class TestGraphBasicExecution:
         result_state, _ = asyncio.run(g(state, shared))
         assert result_state.value == 7
 
+    def test_eager_task_factory_is_restored(self):
+        g = Graph[SimpleState, SimpleShared](edges=[(START, inc, END)], eager=True)
+
+        async def run():
+            await g(SimpleState(), SimpleShared())
+            return asyncio.get_running_loop().get_task_factory()
+
+        assert asyncio.run(run()) is None
+
+    def test_eager_task_factory_is_opt_in(self):
+        factories: list[object] = []
+
+        class RecordFactory(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                factories.append(asyncio.get_running_loop().get_task_factory())
+
+        asyncio.run(Graph[SimpleState, SimpleShared](edges=[(START, RecordFactory(), END)])(SimpleState(), SimpleShared()))
+        assert factories == [None]
+
+    def test_concurrent_eager_runs_share_the_task_factory(self):
+        factories: list[object] = []
+
+        class WaitForRelease(Node[SimpleState, SimpleShared]):
+            def __init__(self, release: asyncio.Event):
+                self.release = release
+
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                await self.release.wait()
+                factories.append(asyncio.get_running_loop().get_task_factory())
+
+        async def run():
+            release_first, release_second = asyncio.Event(), asyncio.Event()
+            first = Graph[SimpleState, SimpleShared](edges=[(START, WaitForRelease(release_first), END)], eager=True)
+            second = Graph[SimpleState, SimpleShared](edges=[(START, WaitForRelease(release_second), END)], eager=True)
+
+            first_run = asyncio.create_task(first(SimpleState(), SimpleShared()))
+            await asyncio.sleep(0) # The first graph installs the factory
+            second_run = asyncio.create_task(second(SimpleState(), SimpleShared()))
+            await asyncio.sleep(0)
+
+            release_first.set()
+            await first_run # Finishes while the second graph still runs
+            release_second.set()
+            await second_run
+            return asyncio.get_running_loop().get_task_factory()
+
+        assert asyncio.run(run()) is None
+        assert factories == [asyncio.eager_task_factory, asyncio.eager_task_factory]
+
+    def test_task_factory_installed_during_run_is_kept(self):
+        def factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Task[Any]:
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        class InstallFactory(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                asyncio.get_running_loop().set_task_factory(factory)
+
+        async def run():
+            await Graph[SimpleState, SimpleShared](edges=[(START, InstallFactory(), END)], eager=True)(SimpleState(), SimpleShared())
+            return asyncio.get_running_loop().get_task_factory()
+
+        assert asyncio.run(run()) is factory
+
+    def test_non_eager_execution(self):
+        g = Graph[SimpleState, SimpleShared](edges=[(START, inc, END)], eager=False)
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 1
+
+    def test_sequential_nodes_run_in_branch_task(self):
+        tasks: list[asyncio.Task[object] | None] = []
+
+        class RecordTask(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                tasks.append(asyncio.current_task())
+
+        g = Graph[SimpleState, SimpleShared](edges=[(START, RecordTask(), RecordTask(), END)])
+        asyncio.run(g(SimpleState(), SimpleShared()))
+        assert len(tasks) == 2
+        assert tasks[0] is tasks[1]
+
+    def test_sequential_steps_are_validated(self):
+        seen: list[object] = []
+
+        class AssignString(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                setattr(state, "value", "5")
+
+        class RecordValue(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                seen.append(state.value)
+
+        g = Graph[SimpleState, SimpleShared](edges=[(START, AssignString(), RecordValue(), END)])
+        asyncio.run(g(SimpleState(), SimpleShared()))
+        assert seen == [5]
+
+    def test_sequential_steps_run_in_place_with_skip_merge_validation(self):
+        states: list[SimpleState] = []
+
+        class RecordState(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                states.append(state)
+
+        g = Graph[SimpleState, SimpleShared](edges=[(START, RecordState(), RecordState(), END)], skip_merge_validation=True)
+        asyncio.run(g(SimpleState(), SimpleShared()))
+        assert states[0] is states[1]
+
+    def test_overridden_model_validate_is_used_for_merges(self):
+        class CountingState(State):
+            value: int = 0
+            validations: ClassVar[int] = 0
+
+            @classmethod
+            def model_validate(cls, obj: Any, *args: Any, **kwargs: Any) -> Self:
+                cls.validations += 1
+                return super().model_validate(obj, *args, **kwargs)
+
+        class Increment(Node[CountingState, SimpleShared]):
+            async def __call__(self, state: CountingState, shared: SimpleShared) -> None:
+                state.value += 1
+
+        g = Graph[CountingState, SimpleShared](edges=[(START, Increment(), END)])
+        result_state, _ = asyncio.run(g(CountingState(), SimpleShared()))
+        assert result_state.value == 1
+        assert CountingState.validations > 0
+
+    def test_final_state_is_validated_after_in_place_steps(self):
+        class AssignString(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                setattr(state, "value", "5")
+
+        g = Graph[SimpleState, SimpleShared](edges=[(START, AssignString(), END)], skip_merge_validation=True)
+        result_state, _ = asyncio.run(g(SimpleState(), SimpleShared()))
+        assert result_state.value == 5
+
+    @pytest.mark.parametrize("skip_merge_validation", [False, True])
+    def test_validators_run_between_sequential_steps(self, skip_merge_validation: bool):
+        class ValidatedState(State):
+            x: int = 0
+
+            @field_validator("x")
+            @classmethod
+            def non_negative(cls, v: int) -> int:
+                if v < 0:
+                    raise ValueError("negative")
+                return v
+
+        reached: list[bool] = []
+
+        class SetNegative(Node[ValidatedState, SimpleShared]):
+            async def __call__(self, state: ValidatedState, shared: SimpleShared) -> None:
+                state.x = -1
+
+        class Record(Node[ValidatedState, SimpleShared]):
+            async def __call__(self, state: ValidatedState, shared: SimpleShared) -> None:
+                reached.append(True)
+
+        g = Graph[ValidatedState, SimpleShared](edges=[(START, SetNegative(), Record(), END)], skip_merge_validation=skip_merge_validation)
+        with pytest.raises((ValidationError, ExceptionGroup)):
+            asyncio.run(g(ValidatedState(), SimpleShared()))
+        assert reached == []
+
+    def test_input_state_is_not_mutated(self):
+        state = SimpleState(value=0)
+        g = Graph[SimpleState, SimpleShared](edges=[(START, IncrementNode(), IncrementNode(), END)])
+        result_state, _ = asyncio.run(g(state, SimpleShared()))
+        assert result_state.value == 2
+        assert state.value == 0
+
+    def test_spawned_branch_keeps_state_of_spawn(self):
+        class CopyValueToName(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                state.name = str(state.value)
+
+        inc = IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, inc, END), (inc, CopyValueToName(), END)], eager=False)
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 1
+        assert result_state.name == "0"
+
+    def test_unchanged_state_is_returned_as_copy(self):
+        class ReadItems(Node[NestedState, SimpleShared]):
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                assert state.items == [1]
+
+        state = NestedState(items=[1])
+        g = Graph[NestedState, SimpleShared](edges=[(START, ReadItems(), END)])
+        result_state, _ = asyncio.run(g(state, SimpleShared()))
+        assert result_state == state
+        assert result_state is not state
+        assert result_state.items is not state.items
+
     def test_shared_is_same_object(self):
         state = SimpleState()
         shared = SimpleShared()
@@ -208,6 +541,35 @@ class TestGraphBasicExecution:
         _, result_shared = asyncio.run(g(state, shared))
         assert result_shared is shared
 
+    def test_branches_are_slotted_and_hashed_by_identity(self):
+        n = IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n, END), ([n, START], NoOpNode(), END)])
+        branches = {b for bs in g.branch_registry.values() for b in bs}
+        assert len(branches) == 3
+        assert not any(hasattr(b, "__dict__") for b in branches)
+
+    def test_registries_are_not_filled_by_a_run(self):
+        n1 = IncrementNode()
+        n2 = IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n1, n2, END)])
+        sources = set(g.branch_registry)
+        for expected in (2, 2):
+            result_state, _ = asyncio.run(g(SimpleState(), SimpleShared()))
+            assert result_state.value == expected
+            assert set(g.branch_registry) == sources
+            assert g.join_registry == {}
+
+    def test_planned_next_nodes_are_named_tuples(self):
+        n = IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n, END)])
+        (planned,) = g.branch_registry[START][0].plan[(START,)]
+        node, entry = planned
+        assert node is planned.node is n
+        assert entry is planned.reached_by
+        assert not hasattr(planned, "__dict__")
+        assert not hasattr(entry, "__dict__")
+        assert (entry.index, entry.callable_next, entry.async_next) == (0, False, False)
+
 
 # ===========================================================================
 # Tests: Graph – conditional edges
@@ -254,6 +616,85 @@ class TestGraphConditionalEdges:
         assert result_state.value == 1
 
 
+    def test_async_conditionals_are_awaited_concurrently(self):
+        both_called = asyncio.Event()
+        calls: list[int] = []
+
+        async def router(state: SimpleState, shared: SimpleShared):
+            calls.append(1)
+            if len(calls) == 2:
+                both_called.set()
+            await asyncio.wait_for(both_called.wait(), timeout=1) # Times out if the routers are awaited one after another
+            return None
+
+        g = Graph(edges=[(START, [IncrementNode(), SetNameNode("x")], router, END)])
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert len(calls) == 2
+        assert result_state.value == 1
+
+    def test_sync_conditional_returning_coroutine(self):
+        inc = IncrementNode()
+        second = IncrementNode()
+
+        async def route(state: SimpleState):
+            return second
+
+        state = SimpleState(value=0)
+        shared = SimpleShared()
+        g = Graph(edges=[(START, inc, lambda state, shared: route(state), END)])
+        result_state, _ = asyncio.run(g(state, shared))
+        assert result_state.value == 2
+
+    def test_sync_conditional_returning_future(self):
+        second = IncrementNode()
+
+        def route(state: SimpleState, shared: SimpleShared) -> asyncio.Future[IncrementNode]:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(second)
+            return future
+
+        class Later:
+            def __await__(self) -> Generator[Any, None, IncrementNode]:
+                return (yield from asyncio.sleep(0, result=second).__await__())
+
+        g = Graph(edges=[(START, IncrementNode(), route, END)])
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 2
+
+        g = Graph(edges=[(START, IncrementNode(), lambda state, shared: Later(), END)])
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 2
+
+    def test_pure_conditional_is_called_once(self):
+        inc = IncrementNode()
+        noop = NoOpNode()
+        calls: list[int] = []
+
+        @pure_edge
+        def router(state: SimpleState, shared: SimpleShared):
+            calls.append(state.value)
+            return noop
+
+        g = Graph(edges=[(START, inc, router, END)])
+        for _ in range(2):
+            result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+            assert result_state.value == 1
+        assert calls == [1]
+
+    def test_impure_conditional_is_called_every_time(self):
+        inc = IncrementNode()
+        calls: list[int] = []
+
+        def router(state: SimpleState, shared: SimpleShared):
+            calls.append(state.value)
+            return None
+
+        g = Graph(edges=[(START, inc, router, END)])
+        asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        asyncio.run(g(SimpleState(value=5), SimpleShared()))
+        assert calls == [1, 6]
+
+
 # ===========================================================================
 # Tests: Graph – parallel execution and merge
 # ===========================================================================
@@ -285,6 +726,107 @@ class TestGraphParallelExecution:
         assert result_state.value == 99
         assert result_state.name == "hello"
 
+    def test_parallel_merge_without_validation(self):
+        class AppendItem(Node[NestedState, SimpleShared]):
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                state.items.append(1)
+
+        class SetLabel(Node[NestedState, SimpleShared]):
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                state.label = "set"
+
+        state = NestedState(items=[0])
+        g = Graph(edges=[(START, [AppendItem(), SetLabel()], END)], skip_merge_validation=True)
+        result_state, _ = asyncio.run(g(state, SimpleShared()))
+        assert result_state.items == [0, 1]
+        assert result_state.label == "set"
+        assert state.items == [0]
+
+    def test_parallel_appends_through_iteration_conflict(self):
+        class AppendByIteration(Node[NestedState, SimpleShared]):
+            def __init__(self, item: int):
+                self.item = item
+
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                for name, value in state:
+                    if name == "items":
+                        value.append(self.item)
+
+        state = NestedState(items=[0])
+        g = Graph(edges=[(START, [AppendByIteration(1), AppendByIteration(2)], END)])
+        with pytest.raises((ChangeConflictException, ExceptionGroup)):
+            asyncio.run(g(state, SimpleShared()))
+        assert state.items == [0]
+
+    def test_parallel_dict_of_state_is_independent(self):
+        class AppendThroughDict(Node[NestedState, SimpleShared]):
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                dict(state)["items"].append(1)
+                state.__dict__["mapping"]["a"] = [1]
+
+        class SetLabel(Node[NestedState, SimpleShared]):
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                state.label = "set"
+
+        state = NestedState(items=[0])
+        result_state, _ = asyncio.run(Graph(edges=[(START, [AppendThroughDict(), SetLabel()], END)])(state, SimpleShared()))
+        assert result_state.items == [0, 1]
+        assert result_state.mapping == {"a": [1]}
+        assert result_state.label == "set"
+        assert state.items == [0]
+        assert state.mapping == {}
+
+    def test_parallel_node_states_are_plain_copies(self):
+        original = NestedState(items=[1], inner=SimpleState(value=2))
+        seen: list[bool] = []
+
+        class Inspect(Node[NestedState, SimpleShared]):
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                seen.append(type(state) is NestedState)
+                seen.append(state == original)
+                seen.append(pickle.loads(pickle.dumps(state)) == state)
+
+        asyncio.run(Graph(edges=[(START, [Inspect(), Inspect()], END)])(original, SimpleShared()))
+        assert seen == [True] * 6
+
+    def test_custom_state_protocol_without_include(self):
+        class PlainState:
+            def __init__(self, values: dict[str, Any]):
+                self.values = values
+
+            def model_dump(self) -> dict[str, Any]:
+                return dict(self.values)
+
+            def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+                return type(self)({**self.values, **(update or {})})
+
+            @classmethod
+            def model_validate(cls, obj: Any) -> Self:
+                return cls(dict(obj))
+
+        class SetKey(Node[PlainState, SimpleShared]):
+            def __init__(self, key: str):
+                self.key = key
+
+            async def __call__(self, state: PlainState, shared: SimpleShared) -> None:
+                state.values[self.key] = 1
+
+        g = Graph[PlainState, SimpleShared](edges=[(START, [SetKey("a"), SetKey("b")], END)])
+        result_state, _ = asyncio.run(g(PlainState({}), SimpleShared()))
+        assert result_state.values == {"a": 1, "b": 1}
+
+    def test_parallel_merge_without_validation_same_field(self):
+        class SetKey(Node[NestedState, SimpleShared]):
+            def __init__(self, key: str):
+                self.key = key
+
+            async def __call__(self, state: NestedState, shared: SimpleShared) -> None:
+                state.mapping[self.key] = [1]
+
+        g = Graph(edges=[(START, [SetKey("a"), SetKey("b")], END)], skip_merge_validation=True)
+        result_state, _ = asyncio.run(g(NestedState(), SimpleShared()))
+        assert result_state.mapping == {"a": [1], "b": [1]}
+
     def test_parallel_conflicting_changes_raise(self):
         """Both nodes modify the same field – should raise ChangeConflictException."""
 
@@ -308,6 +850,107 @@ class TestGraphParallelExecution:
         with pytest.raises((ChangeConflictException, ExceptionGroup)):
             asyncio.run(g(state, shared))
 
+    def test_all_branches_joining_the_same_node_are_merged(self):
+        class SetName(Node[SimpleState, SimpleShared]):
+            async def __call__(self, state: SimpleState, shared: SimpleShared) -> None:
+                state.name = "joined"
+
+        a = NoOpNode()
+        join = NoOpNode()
+        g = Graph[SimpleState, SimpleShared](edges=[
+            (START, a, join, END),
+            (a, IncrementNode(), join),
+            (a, SetName(), join),
+        ])
+        result_state, _ = asyncio.run(g(SimpleState(), SimpleShared()))
+        assert result_state.value == 1
+        assert result_state.name == "joined"
+        assert not g.join_registry.get(join)
+
+    def test_join_before_the_branch_task_started(self):
+        a = NoOpNode()
+        join = NoOpNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, a, join, END), (a, IncrementNode(), join)], eager=False)
+        for _ in range(2):
+            result_state, _ = asyncio.run(g(SimpleState(), SimpleShared()))
+            assert result_state.value == 1
+
+
+# ===========================================================================
+# Tests: Graph – chain fusion
+# ===========================================================================
+
+class TestGraphChainFusion:
+    def test_linear_chain_is_fused(self):
+        n1, n2, n3 = IncrementNode(), IncrementNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n1, n2, n3, END)], fuse=True)
+
+        planned = g.branch_registry[START][0].plan[(START,)]
+        assert len(planned) == 1
+        assert isinstance(planned[0].node, FusedNode)
+        assert planned[0].node.nodes == (n1, n2, n3)
+
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 3
+
+    def test_fusion_disabled(self):
+        n1, n2 = IncrementNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n1, n2, END)], fuse=False)
+
+        assert g.branch_registry[START][0].plan[(START,)][0].node is n1
+
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 2
+
+    def test_chain_ends_at_spawning_node(self):
+        n1, n2, n3 = IncrementNode(), IncrementNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[
+            (START, n1, n2, n3, END),
+            (n2, SetNameNode("spawned"), END),
+        ], fuse=True)
+
+        planned = g.branch_registry[START][0].plan[(START,)]
+        assert planned[0].node is n1
+
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 3
+        assert result_state.name == "spawned"
+
+    def test_parallel_nodes_are_not_fused(self):
+        inc, noop, after = IncrementNode(), NoOpNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, [inc, noop], after, END)], fuse=True)
+
+        planned = g.branch_registry[START][0].plan[(START,)]
+        assert [n.node for n in planned] == [inc, noop]
+
+    def test_dynamic_next_after_chain(self):
+        n1, n2, n3 = IncrementNode(), IncrementNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n1, n2, lambda st, sh: n3 if st.value == 2 else None, END)], fuse=True)
+
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 3
+
+    def test_fusion_is_opt_in(self):
+        n1, n2 = IncrementNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n1, n2, END)])
+        assert g.branch_registry[START][0].plan[(START,)][0].node is n1
+
+    def test_hooks_attached_later_disable_fusion(self):
+        steps: list[list[Node[SimpleState, SimpleShared]]] = []
+
+        class RecordSteps(GraphHook[SimpleState, SimpleShared]):
+            async def on_step_start(self, state: SimpleState, shared: SimpleShared, nodes: list[NextNode[SimpleState, SimpleShared]]) -> None:
+                steps.append([n.node for n in nodes])
+
+        n1, n2 = IncrementNode(), IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, n1, n2, END)], fuse=True)
+        assert isinstance(g.branch_registry[START][0].plan[(START,)][0].node, FusedNode)
+
+        g.hooks = [RecordSteps()]
+        result_state, _ = asyncio.run(g(SimpleState(value=0), SimpleShared()))
+        assert result_state.value == 2
+        assert steps == [[n1], [n2]]
+
 
 # ===========================================================================
 # Tests: Graph – error edges
@@ -371,6 +1014,31 @@ class TestGraphErrorEdges:
         with pytest.raises(ExceptionGroup):
             asyncio.run(g(state, shared))
 
+    def test_error_edge_with_multiple_matching_sources_is_taken_once(self):
+        raiser = RaisingNode(ValueError("boom"))
+        g = Graph[SimpleState, SimpleShared](edges=[(
+            START, raiser,
+            [ValueError, (raiser, Exception)],
+            IncrementNode(),
+            END)
+        ])
+        result_state, _ = asyncio.run(g(SimpleState(), SimpleShared()))
+        assert result_state.value == 1
+
+    def test_on_error_hooks(self):
+        class SwallowHook(GraphHook[SimpleState, SimpleShared]):
+            async def on_error(self, error: Exception, state: SimpleState, shared: SimpleShared) -> Exception | None:
+                return None
+
+        edges = [(START, RaisingNode(TypeError("unhandled")), END)]
+
+        with pytest.raises(ExceptionGroup):
+            asyncio.run(Graph[SimpleState, SimpleShared](edges=edges, hooks=[GraphHook()])(SimpleState(), SimpleShared()))
+
+        g = Graph[SimpleState, SimpleShared](edges=edges, hooks=[GraphHook(), SwallowHook()])
+        result_state, _ = asyncio.run(g(SimpleState(), SimpleShared()))
+        assert result_state.value == 0
+
 
 # ===========================================================================
 # Tests: Graph – instant edges
@@ -428,6 +1096,12 @@ class TestNodeAndState:
         with pytest.raises(TypeError):
             Node()  # type: ignore
 
+    def test_is_node_guard(self):
+        types = Types[SimpleState, SimpleShared]
+        assert types.is_node(IncrementNode())
+        assert types.is_node(FusedNode[SimpleState, SimpleShared]([NoOpNode()]))
+        assert not any(types.is_node(x) for x in (START, END, None, IncrementNode, [NoOpNode()]))
+
     def test_state_deep_copy_is_independent(self):
         s = SimpleState(value=5)
         s2 = s.model_copy(deep=True)
@@ -446,4 +1120,117 @@ class TestNodeAndState:
         assert isinstance(sh.lock, Lock)
 
     
-    
\ No newline at end of file
+    
+
+
+# ===========================================================================
+# Tests: fast state copy
+# ===========================================================================
+
+class TestFastStateCopy:
+    def test_copy_is_equal(self):
+        s = NestedState(items=[1, 2], mapping={"a": [1]}, inner=SimpleState(value=3))
+        assert fast_state_copy(s) == s
+
+    def test_containers_are_independent(self):
+        s = NestedState(items=[1], mapping={"a": [1]})
+        s2 = fast_state_copy(s)
+        s2.items.append(2)
+        s2.mapping["a"].append(2)
+        assert s.items == [1]
+        assert s.mapping == {"a": [1]}
+
+    def test_nested_model_is_independent(self):
+        s = NestedState(inner=SimpleState(value=1))
+        s2 = fast_state_copy(s)
+        s2.inner.value = 99
+        assert s.inner.value == 1
+
+    def test_immutable_leaves_are_shared(self):
+        s = NestedState(label="x" * 100)
+        assert fast_state_copy(s).label is s.label
+
+    def test_fields_set_is_preserved(self):
+        s = NestedState(items=[1])
+        assert fast_state_copy(s).model_fields_set == {"items"}
+
+
+# ===========================================================================
+# Tests: rich rendering
+# ===========================================================================
+
+class TestGraphRenderer:
+
+    def test_pretty_is_bounded(self):
+        console = Console(record=True, width=200)
+        renderer = GraphRenderer[NestedState, SimpleShared](console, max_length=2)
+        renderer.render_graph_end(NestedState(items=[1, 2, 3, 4]), SimpleShared())
+        assert "... +2" in console.export_text()
+
+    def test_step_end_renders_snapshot_table(self):
+        console = Console(record=True, width=200)
+        renderer = GraphRenderer[SimpleState, SimpleShared](console)
+        renderer.render_step_end(SimpleState(value=7), SimpleShared(), [])
+        text = console.export_text()
+        assert "Post-Step Snapshot" in text
+        assert "value=7" in text
+        assert text.rstrip().endswith("Finished executing:")
+
+    def test_branch_rendering_labels_sentinels(self):
+        node = IncrementNode()
+        g = Graph[SimpleState, SimpleShared](edges=[(START, node, END)])
+        branch = g.branch_registry[START][0]
+
+        console = Console(record=True, width=200)
+        renderer = GraphRenderer[SimpleState, SimpleShared](console)
+        renderer.render_spawn_branch_end(branch, NextNode(node, branch.edge_index[START][0]))
+        renderer.render_branch_overview(g.branch_registry, {END: [branch]})
+        text = console.export_text()
+
+        assert "Triggered by: IncrementNode" in text
+        assert "Join Target: END" in text
+        assert "-> IncrementNode (idx=0)" in text
+        assert "START (1 branches)" in text
+        assert "Branch#0 -> join: END" in text
+        assert "END (1 waiting)" in text
+
+    def test_merge_end_renders_changes(self):
+        console = Console(record=True, width=200)
+        renderer = GraphRenderer[SimpleState, SimpleShared](console)
+        renderer.render_merge_end([{}, Diff.recursive_diff({"a": 1, "b": 2}, {"a": 3, "c": 4})])
+        text = console.export_text()
+        assert "Branch 1" in text
+        assert "UPDATED" in text and "REMOVED" in text and "ADDED" in text
+
+        renderer.render_merge_end([{}])
+        assert "No changes detected." in console.export_text()
+
+    def test_quiet_console_builds_nothing(self, monkeypatch: pytest.MonkeyPatch):
+        file = io.StringIO()
+        renderer = GraphRenderer[SimpleState, SimpleShared](Console(file=file, quiet=True))
+
+        def fail(obj: object):
+            raise AssertionError("rendered on a quiet console")
+
+        monkeypatch.setattr(renderer, "_pretty", fail)
+        renderer.render_graph_start(SimpleState(), SimpleShared())
+        renderer.render_step_end(SimpleState(), SimpleShared(), [])
+        renderer.render_graph_end(SimpleState(), SimpleShared())
+        assert file.getvalue() == ""
+
+    def test_batched_writes_once(self):
+        class CountingFile(io.StringIO):
+            writes = 0
+
+            def write(self, s: str) -> int:
+                self.writes += 1
+                return super().write(s)
+
+        file = CountingFile()
+        renderer = GraphRenderer[SimpleState, SimpleShared](Console(file=file, width=80))
+        with renderer.batched():
+            renderer.render_rule("first")
+            renderer.render_rule("second")
+            assert file.writes == 0
+        assert file.writes == 1
+        assert "first" in file.getvalue() and "second" in file.getvalue()